@@ -1,30 +1,319 @@
 #!/usr/bin/env python3
 
 import argparse
+import contextlib
 import dataclasses
 import datetime as dt
+import hashlib
+import html
+import itertools
 import json
+import os
+import pickle
 import re
+import signal
+import sqlite3
 import sys
-import urllib.request
-import xml.etree.ElementTree as ET
+import threading
+import time
+import urllib.parse
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Generator, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# Modules only some code paths need (the HTTP client and its TLS stack, the
+# thread pool, the XML parser, the email parser for local mirrors, git
+# subprocesses) are imported where they are used, to keep start-up cheap for
+# runs that are served from caches, --state-stats and `search`.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools"))
 
 
 def _utcnow() -> dt.datetime:
     return dt.datetime.now(dt.timezone.utc)
 
 
-def _read_text_url(url: str, timeout_seconds: int = 20) -> str:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": "kernel_radar/0.1 (+local)"
-        },
-    )
-    with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+def _open_conditional(
+    url: str,
+    timeout_seconds: int = 20,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    retries: Optional[int] = None,
+):
+    # Returns the open response, or None on 304 Not Modified. Requests go
+    # through the shared keep-alive client, so all feeds on lore.kernel.org
+    # reuse a few connections instead of one TLS handshake per feed.
+    # retries=None uses the client's default.
+    headers: Dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    from radar_http import get_client
+
+    resp = get_client().open(url, headers=headers, timeout=timeout_seconds, retries=retries)
+    if resp.status == 304:
+        resp.close()
+        return None
+    return resp
+
+
+# Cached entry: (title, link, author, ts, parent, paths) as yielded by
+# _atom_items; parent is the link of the message it replies to, or "", and
+# paths are the files a patch touches (see _patch_paths), sorted.
+CachedEntry = Tuple[str, str, str, str, str, Tuple[str, ...]]
+
+
+def _cached_entry(values: Iterable) -> CachedEntry:
+    # Entries cached before `parent` or `paths` were recorded have four or
+    # five fields.
+    values = list(values)
+    title, link, author, ts, parent = (values[:5] + ["", "", "", "", ""])[:5]
+    paths = tuple(values[5]) if len(values) > 5 else ()
+    return title, link, author, ts, parent, paths
+
+
+class FeedCache:
+    """On-disk conditional-GET cache for feeds, keyed by URL.
+
+    Each URL gets one JSON file holding its ETag/Last-Modified validators and
+    the entries parsed from the last 200 response, so a 304 skips both the
+    download and the XML parse.
+    """
+
+    def __init__(self, cache_dir: Path, max_age_days: float = 14.0, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str) -> Optional[Dict]:
+        try:
+            data = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("url") != url:
+            return None
+        if any(len(e) < 6 for e in data.get("entries", [])):
+            # Stored before patch paths were recorded: refetch once.
+            return None
+        return data
+
+    def store(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        entries: List[CachedEntry],
+        cutoff: Optional[dt.datetime] = None,
+        paths: bool = False,
+    ) -> None:
+        # cutoff: parsing stopped at this since-window, so entries older than
+        # it are missing and a run with a wider window must not reuse them.
+        # paths: patch paths were extracted; a run that needs them must not
+        # reuse entries stored without.
+        if not etag and not last_modified:
+            # Without validators the server cannot answer 304; nothing to reuse.
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp = path.with_suffix(".json.tmp")
+        data = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": _utcnow().isoformat(),
+            "cutoff": cutoff.isoformat() if cutoff else None,
+            "paths": paths,
+            "entries": [list(e) for e in entries],
+        }
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    def touch(self, url: str) -> None:
+        # Record a 304 hit so LRU eviction keeps entries that are still in use.
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        # Drop entries unused for max_age_days, then the least recently used
+        # ones until the cache fits in max_bytes.
+        if not self.cache_dir.is_dir():
+            return
+        cutoff = time.time() - self.max_age_days * 86400
+        files = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if st.st_mtime < cutoff:
+                p.unlink(missing_ok=True)
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchResult:
+    url: str
+    entries: Optional[List[CachedEntry]]
+    error: Optional[str]
+    elapsed: float
+    # True on 304 Not Modified: entries come from the cache.
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Set when parsing stopped early at the since-window.
+    cutoff: Optional[dt.datetime] = None
+    # Body bytes transferred, and time spent parsing them (not counting
+    # waits on the network, since parsing is interleaved with the download).
+    bytes: int = 0
+    parse_seconds: float = 0.0
+    # link -> body text of each entry, when requested (not cached on 304).
+    bodies: Optional[Dict[str, str]] = None
+    # True if patch paths were extracted into the entries.
+    paths: bool = False
+
+
+class _TimedChunks:
+    # Wraps a chunk iterator and records the time spent waiting for chunks.
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = chunks
+        self.wait_seconds = 0.0
+
+    def __iter__(self) -> Iterator[bytes]:
+        it = iter(self.chunks)
+        while True:
+            t0 = time.monotonic()
+            try:
+                chunk = next(it)
+            except StopIteration:
+                return
+            finally:
+                self.wait_seconds += time.monotonic() - t0
+            yield chunk
+
+
+def _fetch_feeds(
+    urls: List[str],
+    max_workers: int = 8,
+    per_host: int = 4,
+    budget_seconds: float = 120.0,
+    timeout_seconds: int = 20,
+    cache: Optional[FeedCache] = None,
+    since: Optional[dt.datetime] = None,
+    collect_bodies: bool = False,
+    collect_paths: bool = False,
+) -> Iterator[FetchResult]:
+    # Fetch all feeds concurrently and yield results in completion order, so
+    # the caller can match each feed as soon as it arrives. Each feed is
+    # parsed while it downloads and the download stops once entries fall out
+    # of the since-window.
+    # - per_host bounds concurrent connections to a single host (lore is one host)
+    # - budget_seconds bounds the whole stage; feeds still pending when it runs
+    #   out are reported as errors instead of holding up the digest
+    # - with a cache, requests are conditional and a 304 yields cached entries
+    # - collect_bodies fills FetchResult.bodies from each entry's <content>
+    # - collect_paths records the patch paths found in it on each entry
+    if not urls:
+        return
+
+    import concurrent.futures
+
+    from radar_http import decoded_chunks
+
+    host_sems: Dict[str, threading.BoundedSemaphore] = {}
+    for url in urls:
+        host = urllib.parse.urlsplit(url).netloc
+        host_sems.setdefault(host, threading.BoundedSemaphore(max(1, per_host)))
+
+    deadline = time.monotonic() + budget_seconds
+
+    def fetch_one(url: str) -> FetchResult:
+        sem = host_sems[urllib.parse.urlsplit(url).netloc]
+        with sem:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return FetchResult(url=url, entries=None, error="fetch budget exhausted", elapsed=0.0)
+            cached = cache.load(url) if cache else None
+            if cached and cached.get("cutoff") and since is not None:
+                cached_cutoff = _parse_rfc3339(cached["cutoff"])
+                if cached_cutoff is None or since < cached_cutoff:
+                    cached = None
+            if cached and collect_paths and not cached.get("paths"):
+                cached = None
+            t0 = time.monotonic()
+            try:
+                resp = _open_conditional(
+                    url,
+                    timeout_seconds=max(1, min(timeout_seconds, int(remaining) + 1)),
+                    etag=cached.get("etag") if cached else None,
+                    last_modified=cached.get("last_modified") if cached else None,
+                    # A retry could outlive the budget; the feed is picked up
+                    # again on the next run.
+                    retries=0,
+                )
+                if resp is None:
+                    if cached is None:
+                        raise RuntimeError("304 Not Modified without a cached copy")
+                    entries = [_cached_entry(e) for e in cached.get("entries", [])]
+                    return FetchResult(
+                        url=url, entries=entries, error=None, elapsed=time.monotonic() - t0, not_modified=True
+                    )
+                bodies: Optional[Dict[str, str]] = {} if collect_bodies else None
+                with resp:
+                    chunks = _TimedChunks(decoded_chunks(resp))
+                    t_parse = time.monotonic()
+                    entries, cut = _read_atom_entries(chunks, since=since, bodies=bodies, collect_paths=collect_paths)
+                    parse_seconds = time.monotonic() - t_parse - chunks.wait_seconds
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    nbytes = resp.bytes_read
+            except Exception as e:
+                return FetchResult(url=url, entries=None, error=str(e), elapsed=time.monotonic() - t0)
+            return FetchResult(
+                url=url,
+                entries=entries,
+                error=None,
+                elapsed=time.monotonic() - t0,
+                etag=etag,
+                last_modified=last_modified,
+                cutoff=since if cut else None,
+                bytes=nbytes,
+                parse_seconds=parse_seconds,
+                bodies=bodies,
+                paths=collect_paths,
+            )
+
+    ex = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    futures = {ex.submit(fetch_one, url): url for url in urls}
+    yielded = set()
+    try:
+        for fut in concurrent.futures.as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            yielded.add(fut)
+            yield fut.result()
+    except concurrent.futures.TimeoutError:
+        for fut, url in futures.items():
+            if fut in yielded:
+                continue
+            if fut.done():
+                # Finished between the timeout and this loop.
+                yield fut.result()
+            else:
+                yield FetchResult(url=url, entries=None, error="fetch budget exhausted", elapsed=budget_seconds)
+    finally:
+        # Do not wait for stragglers. The interpreter still joins them at
+        # exit, but each is a single attempt whose timeout is capped at the
+        # budget left when it started.
+        ex.shutdown(wait=False, cancel_futures=True)
 
 
 def _parse_rfc3339(ts: str) -> Optional[dt.datetime]:
@@ -50,53 +339,342 @@ class FeedItem:
     link: str
     author: str
     published: dt.datetime
+    parent: str = ""  # link of the message this one replies to
+    messages: int = 1  # > 1 for a patch series grouped into one item
+    also_on: Tuple[str, ...] = ()  # other lists the same message was posted to
 
+    @property
+    def lists(self) -> str:
+        return ", ".join((self.list_name,) + self.also_on)
 
-def _atom_items(atom_xml: str) -> Iterable[Tuple[str, str, str, str]]:
-    # Yields (title, link, author, updated/published)
-    root = ET.fromstring(atom_xml)
-    # Atom namespace handling
-    ns = {}
-    if root.tag.startswith("{") and "}" in root.tag:
-        ns_uri = root.tag.split("}", 1)[0][1:]
-        ns = {"a": ns_uri}
-        entry_path = "a:entry"
-        title_path = "a:title"
-        link_path = "a:link"
-        author_path = "a:author/a:name"
-        updated_path = "a:updated"
-        published_path = "a:published"
-    else:
-        entry_path = "entry"
-        title_path = "title"
-        link_path = "link"
-        author_path = "author/name"
-        updated_path = "updated"
-        published_path = "published"
-
-    for entry in root.findall(entry_path, ns):
-        title = (entry.findtext(title_path, default="", namespaces=ns) or "").strip()
-        author = (entry.findtext(author_path, default="", namespaces=ns) or "").strip()
-
-        link = ""
-        for ln in entry.findall(link_path, ns):
-            href = ln.attrib.get("href", "")
-            rel = ln.attrib.get("rel", "")
-            if rel in ("alternate", "") and href:
-                link = href
-                break
-        if not link:
-            # fallback: sometimes single link exists
-            ln = entry.find(link_path, ns)
-            if ln is not None:
-                link = ln.attrib.get("href", "")
-
-        ts = (
-            entry.findtext(published_path, default="", namespaces=ns)
-            or entry.findtext(updated_path, default="", namespaces=ns)
-            or ""
+
+@dataclasses.dataclass(frozen=True)
+class FeedSubscription:
+    area: str
+    list_name: str
+
+
+def _feed_registry(cfg: Dict) -> Dict[str, List[FeedSubscription]]:
+    # Several areas may reference the same feed (e.g. linux-kernel/new.atom).
+    # Map each distinct atom URL to every area subscribed to it, so the feed is
+    # downloaded and parsed once per run instead of once per area.
+    # Lists read from a local git mirror are keyed as MIRROR_PREFIX + path.
+    registry: Dict[str, List[FeedSubscription]] = {}
+    for area_name, area_cfg in (cfg.get("areas") or {}).items():
+        for lst in area_cfg.get("lists") or []:
+            source = lst.get("atom")
+            if not source and lst.get("mirror"):
+                source = MIRROR_PREFIX + str(Path(lst["mirror"]).expanduser())
+            if not source:
+                continue
+            registry.setdefault(source, []).append(
+                FeedSubscription(area=area_name, list_name=lst.get("name") or "unknown")
+            )
+    return registry
+
+
+def _mirror_sources(cfg: Dict) -> Dict[str, "PublicInboxMirror"]:
+    # Registry key -> reader for every list configured with `mirror:`.
+    mirrors: Dict[str, PublicInboxMirror] = {}
+    for area_cfg in (cfg.get("areas") or {}).values():
+        for lst in area_cfg.get("lists") or []:
+            if lst.get("atom") or not lst.get("mirror"):
+                continue
+            path = Path(lst["mirror"]).expanduser()
+            link_base = lst.get("url") or f"https://lore.kernel.org/{lst.get('name') or path.name}/"
+            mirrors.setdefault(MIRROR_PREFIX + str(path), PublicInboxMirror(path, link_base))
+    return mirrors
+
+
+def _atom_items(
+    source: Union[str, bytes, Iterable[Union[str, bytes]]],
+    since: Optional[dt.datetime] = None,
+    stop_after_old: int = 25,
+    bodies: Optional[Dict[str, str]] = None,
+    collect_paths: bool = False,
+) -> Generator[CachedEntry, None, bool]:
+    # Yields (title, link, author, updated/published, in-reply-to link,
+    # patch paths) incrementally while the document is still being read;
+    # processed entries are dropped from the tree so memory stays flat on
+    # large pages. lore puts the message in <content> (XHTML). Its text is
+    # only extracted on request: with `collect_paths` the patch paths come
+    # from it (otherwise they are empty), and with `bodies` it is stored
+    # under the link, truncated like mirror bodies.
+    #
+    # lore feeds are newest-first, but Date headers can be slightly out of
+    # order, so with `since` we stop only after `stop_after_old` consecutive
+    # entries older than the window. Returns True if it stopped early.
+    import xml.etree.ElementTree as ET
+
+    if isinstance(source, (str, bytes)):
+        source = [source]
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    ns: Dict[str, str] = {}
+    entry_tag = "entry"
+    title_path = "title"
+    link_path = "link"
+    author_path = "author/name"
+    updated_path = "updated"
+    published_path = "published"
+    content_path = "content"
+    reply_tag = "{http://purl.org/syndication/thread/1.0}in-reply-to"
+    old_run = 0
+
+    for chunk in source:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                    # Atom namespace handling
+                    if root.tag.startswith("{") and "}" in root.tag:
+                        ns_uri = root.tag.split("}", 1)[0][1:]
+                        ns = {"a": ns_uri}
+                        entry_tag = "{%s}entry" % ns_uri
+                        title_path = "a:title"
+                        link_path = "a:link"
+                        author_path = "a:author/a:name"
+                        updated_path = "a:updated"
+                        published_path = "a:published"
+                        content_path = "a:content"
+                continue
+            if elem.tag != entry_tag:
+                continue
+
+            entry = elem
+            title = (entry.findtext(title_path, default="", namespaces=ns) or "").strip()
+            author = (entry.findtext(author_path, default="", namespaces=ns) or "").strip()
+
+            link = ""
+            for ln in entry.findall(link_path, ns):
+                href = ln.attrib.get("href", "")
+                rel = ln.attrib.get("rel", "")
+                if rel in ("alternate", "") and href:
+                    link = href
+                    break
+            if not link:
+                # fallback: sometimes single link exists
+                ln = entry.find(link_path, ns)
+                if ln is not None:
+                    link = ln.attrib.get("href", "")
+
+            ts = (
+                entry.findtext(published_path, default="", namespaces=ns)
+                or entry.findtext(updated_path, default="", namespaces=ns)
+                or ""
+            )
+            # RFC 4685 thread extension; lore gives the parent's URL in href.
+            # ref is an identifier (urn:uuid:...), not a link, so it is not used.
+            reply = entry.find(reply_tag)
+            parent = reply.attrib.get("href", "") if reply is not None else ""
+            content = entry.find(content_path, ns) if collect_paths or bodies is not None else None
+            text = _atom_content_text(content) if content is not None else ""
+            paths = tuple(sorted(_patch_paths(text))) if collect_paths and text else ()
+            if bodies is not None and link and text:
+                bodies[link] = text[: MessageIndex.MAX_BODY]
+            if root is not None:
+                root.clear()
+            yield title, link, author, ts, parent, paths
+
+            if since is not None:
+                published = _parse_rfc3339(ts)
+                if published is not None and published.tzinfo is None:
+                    published = published.replace(tzinfo=dt.timezone.utc)
+                if published is not None and published < since:
+                    old_run += 1
+                    if old_run >= stop_after_old:
+                        return True
+                else:
+                    old_run = 0
+
+    parser.close()
+    return False
+
+
+def _atom_content_text(content) -> str:
+    # type="xhtml" (lore) is parsed as elements; type="html" is escaped markup.
+    text = "".join(content.itertext())
+    if content.attrib.get("type") == "html":
+        text = html.unescape(re.sub(r"<[^>]*>", "", text))
+    return text
+
+
+def _read_atom_entries(
+    source: Union[str, bytes, Iterable[Union[str, bytes]]],
+    since: Optional[dt.datetime] = None,
+    bodies: Optional[Dict[str, str]] = None,
+    collect_paths: bool = False,
+) -> Tuple[List[CachedEntry], bool]:
+    # Collect _atom_items() and report whether it stopped at the since-window.
+    entries: List[CachedEntry] = []
+    it = _atom_items(source, since=since, bodies=bodies, collect_paths=collect_paths)
+    while True:
+        try:
+            entries.append(next(it))
+        except StopIteration as stop:
+            return entries, bool(stop.value)
+
+
+MIRROR_PREFIX = "mirror:"
+
+
+class PublicInboxMirror:
+    """Incremental reader for a local public-inbox git mirror (e.g. grokmirror).
+
+    `path` is either an inbox directory holding v2 epochs (git/0.git,
+    git/1.git, ...) or a single bare repo (a v1 inbox or one epoch). Every
+    commit in such a repo adds one message as a blob, so reading new mail is
+    a `git log` over the commits after the last one processed plus one
+    `git cat-file --batch` for their blobs; nothing goes over the network.
+
+    Links are built as <link_base><Message-ID>/, the same form lore's Atom
+    feeds use, so dedupe state is shared with HTTP-fetched lists.
+    """
+
+    def __init__(self, path: Path, link_base: str):
+        self.path = path
+        self.link_base = link_base if link_base.endswith("/") else link_base + "/"
+
+    def epochs(self) -> List[Path]:
+        git_dir = self.path / "git"
+        if git_dir.is_dir():
+            found = [p for p in git_dir.glob("*.git") if p.stem.isdigit()]
+            return sorted(found, key=lambda p: int(p.stem))
+        return [self.path]
+
+    def _git(self, epoch: Path, *args: str, stdin: Optional[bytes] = None) -> Optional[bytes]:
+        import subprocess
+
+        proc = subprocess.run(
+            ["git", f"--git-dir={epoch}", *args], input=stdin, capture_output=True, check=False
         )
-        yield title, link, author, ts
+        return proc.stdout if proc.returncode == 0 else None
+
+    def _new_blobs(
+        self, epoch: Path, last: Optional[str], head: str, since: Optional[dt.datetime]
+    ) -> List[Tuple[int, str]]:
+        # (commit time, blob) for messages added after `last`, oldest first.
+        # public-inbox stores the message as "m" (v2) or under a hashed path
+        # (v1); "d" records a deletion and is skipped.
+        rev = f"{last}..{head}" if last else head
+        args = ["log", "--reverse", "--no-renames", "--raw", "--no-abbrev", "--format=%x00%ct", rev]
+        if since is not None:
+            args.insert(1, f"--since={int(since.timestamp())}")
+        out = self._git(epoch, *args)
+        if out is None:
+            raise RuntimeError(f"git log failed in {epoch}")
+        blobs: List[Tuple[int, str]] = []
+        for chunk in out.split(b"\0")[1:]:
+            lines = chunk.decode("ascii", "replace").splitlines()
+            if not lines:
+                continue
+            ctime = int(lines[0].strip() or 0)
+            for line in lines[1:]:
+                if not line.startswith(":"):
+                    continue
+                meta, _, path = line.partition("\t")
+                fields = meta.split()
+                if len(fields) >= 5 and fields[4] in ("A", "M") and path != "d":
+                    blobs.append((ctime, fields[3]))
+        return blobs
+
+    def _entry(self, raw: bytes, ctime: int) -> Optional[CachedEntry]:
+        import email.parser
+        import email.policy
+        import email.utils
+
+        msg = email.parser.BytesHeaderParser(policy=email.policy.default).parsebytes(raw)
+        try:
+            subject = str(msg.get("Subject", ""))
+            sender = str(msg.get("From", ""))
+            msgid = str(msg.get("Message-ID", "")).strip().strip("<>")
+            date = str(msg.get("Date", ""))
+            in_reply_to = str(msg.get("In-Reply-To", "")).strip()
+        except Exception:
+            return None
+        if not msgid:
+            return None
+        name, addr = email.utils.parseaddr(sender)
+        try:
+            published = email.utils.parsedate_to_datetime(date)
+        except (TypeError, ValueError):
+            published = None
+        if published is None:
+            published = dt.datetime.fromtimestamp(ctime, dt.timezone.utc)
+        elif published.tzinfo is None:
+            published = published.replace(tzinfo=dt.timezone.utc)
+        link = self._link(msgid)
+        parent_id = re.search(r"<([^<>]+)>", in_reply_to)
+        parent = self._link(parent_id.group(1)) if parent_id else ""
+        return " ".join(subject.split()), link, name or addr, published.isoformat(), parent, ()
+
+    def _link(self, msgid: str) -> str:
+        return self.link_base + urllib.parse.quote(msgid, safe="@!$&'()*+,;=:~") + "/"
+
+    @staticmethod
+    def _body(raw: bytes) -> str:
+        import email.parser
+        import email.policy
+
+        msg = email.parser.BytesParser(policy=email.policy.default).parsebytes(raw)
+        try:
+            part = msg.get_body(preferencelist=("plain",))
+            return part.get_content() if part is not None else ""
+        except (LookupError, ValueError, AttributeError):
+            return ""
+
+    def read(
+        self,
+        heads: Dict[str, str],
+        since: Optional[dt.datetime] = None,
+        bodies: Optional[Dict[str, str]] = None,
+        collect_paths: bool = False,
+    ) -> Tuple[List[CachedEntry], Dict[str, str]]:
+        # `heads` maps epoch path -> last processed commit. Epochs without a
+        # usable head are read back to `since`. Returns the new entries and
+        # the updated heads; with `bodies`, also fills link -> plain-text
+        # body, and with `collect_paths` records the patch paths found in the
+        # body on the entry.
+        entries: List[CachedEntry] = []
+        new_heads = dict(heads)
+        for epoch in self.epochs():
+            out = self._git(epoch, "rev-parse", "-q", "--verify", "HEAD^{commit}")
+            if out is None:
+                continue  # empty epoch
+            head = out.decode().strip()
+            last = heads.get(str(epoch))
+            if last == head:
+                continue
+            if last and self._git(epoch, "cat-file", "-e", f"{last}^{{commit}}") is None:
+                last = None  # history was rewritten; fall back to the window
+            blobs = self._new_blobs(epoch, last, head, since)
+            if blobs:
+                out = self._git(epoch, "cat-file", "--batch", stdin="".join(b + "\n" for _, b in blobs).encode())
+                if out is None:
+                    raise RuntimeError(f"git cat-file failed in {epoch}")
+                pos = 0
+                for ctime, _ in blobs:
+                    eol = out.index(b"\n", pos)
+                    header = out[pos:eol].split()
+                    pos = eol + 1
+                    if len(header) < 3 or header[1] != b"blob":
+                        continue
+                    size = int(header[2])
+                    raw = out[pos : pos + size]
+                    pos += size + 1
+                    entry = self._entry(raw, ctime)
+                    if entry is not None:
+                        if bodies is not None or collect_paths:
+                            body = self._body(raw)
+                            if bodies is not None:
+                                bodies[entry[1]] = body
+                            if collect_paths:
+                                entry = entry[:5] + (tuple(sorted(_patch_paths(body))),)
+                        entries.append(entry)
+            new_heads[str(epoch)] = head
+        return entries, new_heads
 
 
 def _load_yaml_minimal(path: Path) -> Dict:
@@ -129,6 +707,247 @@ def _matches_any(text: str, patterns: List[re.Pattern]) -> bool:
     return any(p.search(text) for p in patterns)
 
 
+def _compile_alternation(patterns: List[str]) -> List[re.Pattern]:
+    # Join the patterns into one regex so a subject is scanned once instead of
+    # once per pattern. Patterns with backreferences or inline global flags
+    # cannot be joined safely; keep those as separate regexes.
+    if len(patterns) < 2:
+        return _compile_any(patterns)
+    for p in patterns:
+        if re.search(r"\\\d|\(\?P=|^\(\?[aiLmsux]+\)", p):
+            return _compile_any(patterns)
+    try:
+        return [re.compile("|".join(f"(?:{p})" for p in patterns), flags=re.IGNORECASE)]
+    except re.error:
+        return _compile_any(patterns)
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    # Build a prefix-trie shaped regex for literal words, e.g.
+    # ["cgroup", "cgroup2", "cpuset"] -> "c(?:group(?:2)?|puset)".
+    # Matching walks the trie in the regex engine, so the cost per position
+    # depends on keyword length, not on the number of keywords.
+    trie: Dict[str, Dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer the longer keyword when this node also ends one.
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+@dataclasses.dataclass(frozen=True)
+class Classification:
+    included: bool
+    excluded: bool
+    areas: FrozenSet[str]
+
+    @property
+    def accepted(self) -> bool:
+        return self.included and not self.excluded
+
+
+class SubjectClassifier:
+    """Match a subject against every area and the global filters at once.
+
+    Built once from the config:
+    - all area keywords go into one trie-shaped regex; a zero-width lookahead
+      reports the longest keyword starting at each position in a single scan
+    - every keyword carries the areas of all keywords contained in it, so
+      shorter keywords hidden inside a longer match are still credited
+    - include/exclude filters are each joined into one alternation
+
+    Areas without keywords match every subject (as before).
+    """
+
+    def __init__(
+        self,
+        area_keywords: Dict[str, List[str]],
+        include_patterns: List[str],
+        exclude_patterns: List[str],
+    ):
+        self.match_all: FrozenSet[str] = frozenset(
+            area for area, kws in area_keywords.items() if not kws or any(not k for k in kws)
+        )
+        direct: Dict[str, Set[str]] = {}
+        for area, kws in area_keywords.items():
+            for kw in kws:
+                if kw:
+                    direct.setdefault(kw.lower(), set()).add(area)
+        self.keyword_areas: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(a for other, areas in direct.items() if other in kw for a in areas) for kw in direct
+        }
+        self.keyword_re: Optional[re.Pattern] = (
+            re.compile("(?=(" + _trie_regex(self.keyword_areas) + "))") if self.keyword_areas else None
+        )
+        self.all_areas = frozenset(area_keywords)
+        self.include_re = _compile_alternation(include_patterns)
+        self.exclude_re = _compile_alternation(exclude_patterns)
+
+    def areas(self, subject: str) -> FrozenSet[str]:
+        found: Set[str] = set(self.match_all)
+        if self.keyword_re is not None:
+            for m in self.keyword_re.finditer(subject.lower()):
+                found.update(self.keyword_areas[m.group(1)])
+                if len(found) == len(self.all_areas):
+                    break
+        return frozenset(found)
+
+    def classify(self, subject: str) -> Classification:
+        # Area matching is skipped for subjects the filters already reject.
+        included = not self.include_re or _matches_any(subject, self.include_re)
+        excluded = bool(self.exclude_re) and _matches_any(subject, self.exclude_re)
+        if not included or excluded:
+            return Classification(included=included, excluded=excluded, areas=frozenset())
+        return Classification(included=included, excluded=excluded, areas=self.areas(subject))
+
+
+def _build_classifier(cfg: Dict) -> SubjectClassifier:
+    filters = cfg.get("filters", {}) or {}
+    return SubjectClassifier(
+        {name: list(area_cfg.get("keywords") or []) for name, area_cfg in (cfg.get("areas") or {}).items()},
+        filters.get("include_subject_regex", []) or [],
+        filters.get("exclude_subject_regex", []) or [],
+    )
+
+
+class _PathNode:
+    # One directory component of the MAINTAINERS path trie. Entries are
+    # (section number, is X: exclude).
+    __slots__ = ("children", "tree", "exact", "globs")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PathNode"] = {}
+        self.tree: List[Tuple[int, bool]] = []  # this directory and everything below
+        self.exact: List[Tuple[int, bool]] = []  # this file only
+        self.globs: List[Tuple[re.Pattern, int, bool]] = []  # wildcard patterns rooted here
+
+
+class MaintainersIndex:
+    """Maps the paths a patch touches to areas via kernel MAINTAINERS.
+
+    Areas list MAINTAINERS section titles (regexes) under `maintainers:`;
+    only sections matching one of them are indexed. F: and X: patterns are
+    stored in a trie of path components: literal directories and files at
+    their node, wildcard patterns compiled once and stored under their
+    literal leading directories. A lookup walks one branch of the trie per
+    path and tests only the globs met on the way. N: regexes are tested
+    against every path.
+
+    Pattern semantics follow scripts/get_maintainer.pl: a trailing slash
+    (or, lacking the tree to check, a last component without a dot) covers
+    the whole directory, and `*` does not cross directory levels.
+    """
+
+    def __init__(self, text: str, area_sections: Dict[str, List[str]]):
+        # identifies the file and mapping the index was built from
+        self.digest = hashlib.sha1(
+            text.encode("utf-8") + json.dumps(area_sections, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self.root = _PathNode()
+        self.regexes: List[Tuple[re.Pattern, int, bool]] = []
+        self.section_areas: List[FrozenSet[str]] = []
+        self.mapped_areas = frozenset(area_sections)
+        title_res = {area: _compile_alternation(pats) for area, pats in area_sections.items()}
+
+        for title, entries in _maintainers_sections(text):
+            areas = frozenset(area for area, rx in title_res.items() if _matches_any(title, rx))
+            if not areas:
+                continue
+            sec = len(self.section_areas)
+            self.section_areas.append(areas)
+            for tag, value in entries:
+                if tag in ("F", "X"):
+                    self._add_pattern(value, sec, tag == "X")
+                elif tag == "N":
+                    try:
+                        self.regexes.append((re.compile(value), sec, False))
+                    except re.error:
+                        print(f"WARN: bad N: pattern in MAINTAINERS section {title!r}: {value}", file=sys.stderr)
+
+    def _add_pattern(self, pattern: str, sec: int, exclude: bool) -> None:
+        parts = [p for p in pattern.split("/") if p]
+        if not parts:
+            return
+        node = self.root
+        for i, part in enumerate(parts):
+            if any(c in part for c in "*?["):
+                rx = "/".join(re.escape(p) for p in parts[:i])
+                for p in parts[i:]:
+                    glob = re.escape(p).replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+                    rx = f"{rx}/{glob}" if rx else glob
+                end = "(?:/|$)" if pattern.endswith("/") else "$"
+                node.globs.append((re.compile(f"^{rx}{end}"), sec, exclude))
+                return
+            node = node.children.setdefault(part, _PathNode())
+        if pattern.endswith("/") or "." not in parts[-1]:
+            node.tree.append((sec, exclude))
+        else:
+            node.exact.append((sec, exclude))
+
+    def _sections(self, path: str) -> Set[int]:
+        hits: List[Tuple[int, bool]] = []
+        node: Optional[_PathNode] = self.root
+        parts = path.split("/")
+        for i in range(len(parts) + 1):
+            hits.extend((sec, excl) for rx, sec, excl in node.globs if rx.match(path))
+            if i == len(parts):
+                break
+            node = node.children.get(parts[i])
+            if node is None:
+                break
+            hits.extend(node.tree)
+            if i == len(parts) - 1:
+                hits.extend(node.exact)
+        hits.extend((sec, excl) for rx, sec, excl in self.regexes if rx.search(path))
+        return {sec for sec, excl in hits if not excl} - {sec for sec, excl in hits if excl}
+
+    def areas(self, paths: Iterable[str]) -> FrozenSet[str]:
+        found: Set[str] = set()
+        for path in paths:
+            for sec in self._sections(path):
+                found.update(self.section_areas[sec])
+        return frozenset(found)
+
+
+def _maintainers_sections(text: str) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+    # Yields (section title, [(tag, value), ...]). A section is a title line
+    # followed by "<letter>:\tvalue" lines; the indented preamble has none.
+    title: Optional[str] = None
+    entries: List[Tuple[str, str]] = []
+    for line in text.splitlines():
+        m = re.match(r"^([A-Z]):\s*(.*?)\s*$", line)
+        if m and title is not None:
+            entries.append((m.group(1), m.group(2)))
+        elif line.strip() and not line[0].isspace() and not m:
+            if title is not None and entries:
+                yield title, entries
+            title, entries = line.strip(), []
+    if title is not None and entries:
+        yield title, entries
+
+
+_DIFF_GIT_RE = re.compile(r"^diff --git a/(\S+) b/(\S+)$", re.MULTILINE)
+_DIFFSTAT_RE = re.compile(r"^ (\S+)\s+\|\s+(?:\d+|Bin)\b", re.MULTILINE)
+
+
+def _patch_paths(body: str) -> Set[str]:
+    # Paths touched by a patch (diff headers) or a cover letter (diffstat;
+    # paths git shortened to ".../tail" are skipped).
+    paths = {p for m in _DIFF_GIT_RE.finditer(body) for p in m.groups()}
+    paths.update(p for p in _DIFFSTAT_RE.findall(body) if not p.startswith("..."))
+    return paths
+
+
 def _load_state(path: Path) -> Dict:
     if not path.exists():
         return {"seen_links": []}
@@ -138,17 +957,587 @@ def _load_state(path: Path) -> Dict:
         return {"seen_links": []}
 
 
-def _save_state(path: Path, state: Dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+class SeenStore:
+    """Dedupe state: links that already appeared in a digest.
+
+    Backed by an indexed SQLite table, so membership checks are index
+    lookups and a run only inserts the links it adds; neither startup nor
+    save cost grows with the size of the history.
+
+    Each link records when it was first seen. Links older than the widest
+    window we run with can never match a feed entry again, so compact()
+    drops them to keep the table bounded.
+
+    Lore links are stored by their Message-ID (see _message_key), so a
+    message cross-posted to several lists is one entry whichever list's
+    copy is looked up.
+
+    On first use, links from a legacy JSON state file (``{"seen_links": [...]}``)
+    are imported. The JSON file is left in place.
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: Path, legacy_json: Optional[Path] = None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.lookups = 0
+        self.hits = 0
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        if legacy_json is not None:
+            self._migrate_json(legacy_json)
+
+    def _init_schema(self) -> None:
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        now = int(time.time())
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_links (link TEXT PRIMARY KEY, first_seen INTEGER) WITHOUT ROWID"
+            )
+            if version < 1:
+                cols = [r[1] for r in self.conn.execute("PRAGMA table_info(seen_links)")]
+                if "first_seen" not in cols:
+                    # Links from before timestamps were recorded age out from now.
+                    self.conn.execute("ALTER TABLE seen_links ADD COLUMN first_seen INTEGER")
+                    self.conn.execute("UPDATE seen_links SET first_seen = ?", (now,))
+            self.conn.execute("CREATE INDEX IF NOT EXISTS seen_links_first_seen ON seen_links (first_seen)")
+            if version < 2:
+                # Re-key stored lore links by Message-ID.
+                rekeyed = [
+                    (link, key, first_seen)
+                    for link, first_seen in self.conn.execute("SELECT link, first_seen FROM seen_links")
+                    if (key := _message_key(link)) != link
+                ]
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)",
+                    ((key, first_seen) for _, key, first_seen in rekeyed),
+                )
+                self.conn.executemany("DELETE FROM seen_links WHERE link = ?", ((link,) for link, _, _ in rekeyed))
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _migrate_json(self, legacy_json: Path) -> None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        if row is not None or not legacy_json.exists():
+            return
+        links = _load_state(legacy_json).get("seen_links", [])
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)",
+                ((_message_key(str(x)), now) for x in links),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (str(legacy_json),)
+            )
+        print(f"INFO: imported {len(links)} seen links from {legacy_json} into {self.path}", file=sys.stderr)
+
+    def __contains__(self, link: str) -> bool:
+        self.lookups += 1
+        key = _message_key(link)
+        hit = self.conn.execute("SELECT 1 FROM seen_links WHERE link = ?", (key,)).fetchone() is not None
+        if hit:
+            self.hits += 1
+        return hit
+
+    def add_many(self, links: Iterable[str]) -> None:
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)",
+                ((_message_key(x), now) for x in links),
+            )
+
+    def compact(self, max_age_seconds: float) -> int:
+        # Drop links first seen more than max_age_seconds ago; returns the
+        # number of links removed. Reclaims file space after large deletes.
+        cutoff = int(time.time() - max_age_seconds)
+        with self.conn:
+            deleted = self.conn.execute("DELETE FROM seen_links WHERE first_seen < ?", (cutoff,)).rowcount
+        if deleted >= 10000:
+            self.conn.execute("VACUUM")
+        return deleted
+
+    def mirror_heads(self) -> Dict[str, str]:
+        # Last processed commit per public-inbox mirror epoch (by git dir).
+        rows = self.conn.execute("SELECT key, value FROM meta WHERE key LIKE 'mirror_head:%'")
+        return {key[len("mirror_head:") :]: value for key, value in rows}
+
+    def set_mirror_heads(self, heads: Dict[str, str]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (("mirror_head:" + epoch, head) for epoch, head in heads.items()),
+            )
+
+    def _meta_int(self, key: str) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        try:
+            return int(row[0]) if row else 0
+        except ValueError:
+            return 0
+
+    def record_run(self) -> None:
+        # Persist this run's lookup/hit counters for --state-stats.
+        values = {
+            "last_lookups": self.lookups,
+            "last_hits": self.hits,
+            "total_lookups": self._meta_int("total_lookups") + self.lookups,
+            "total_hits": self._meta_int("total_hits") + self.hits,
+        }
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                ((k, str(v)) for k, v in values.items()),
+            )
+
+    def stats(self) -> Dict[str, object]:
+        count, oldest, newest = self.conn.execute(
+            "SELECT COUNT(*), MIN(first_seen), MAX(first_seen) FROM seen_links"
+        ).fetchone()
+        return {
+            "links": count,
+            "db_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "oldest_first_seen": oldest,
+            "newest_first_seen": newest,
+            "last_lookups": self._meta_int("last_lookups"),
+            "last_hits": self._meta_int("last_hits"),
+            "total_lookups": self._meta_int("total_lookups"),
+            "total_hits": self._meta_int("total_hits"),
+        }
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _lore_message_id(link: str) -> Optional[str]:
+    # https://lore.kernel.org/<list>/<message-id>/ -> <message-id>
+    m = re.match(r"^https?://[^/?#]+/[^/?#]+/([^/?#]+)/?$", link)
+    if not m:
+        return None
+    msgid = urllib.parse.unquote(m.group(1))
+    return msgid if "@" in msgid else None
+
+
+def _message_key(link: str) -> str:
+    # A message cross-posted to several lists has one lore link per list
+    # but a single Message-ID; items and seen-state are keyed on it.
+    return _lore_message_id(link) or link
+
+
+class MessageIndex:
+    """Full-text index (SQLite FTS5) of every entry kernel_radar ingests.
+
+    Each feed page or mirror read is inserted in one transaction; entries
+    already indexed (by link) are skipped, so re-reading a page costs only
+    the unique-key lookups. Bodies (local mirrors, and the <content> of
+    fetched Atom entries) are indexed truncated to MAX_BODY characters.
+
+    Queried by `kernel_radar.py search`.
+    """
+
+    SCHEMA_VERSION = 1
+    MAX_BODY = 64 * 1024
+    RETENTION_DAYS = 180  # default index.retention_days
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    link TEXT NOT NULL UNIQUE,
+                    message_id TEXT,
+                    list_name TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    published INTEGER NOT NULL,
+                    body TEXT NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS messages_published ON messages (published)")
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+                "subject, author, body, content='messages', content_rowid='id')"
+            )
+            self.conn.execute(
+                """CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                    INSERT INTO messages_fts (rowid, subject, author, body)
+                    VALUES (new.id, new.subject, new.author, new.body);
+                END"""
+            )
+            self.conn.execute(
+                """CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                    INSERT INTO messages_fts (messages_fts, rowid, subject, author, body)
+                    VALUES ('delete', old.id, old.subject, old.author, old.body);
+                END"""
+            )
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def add(
+        self,
+        list_name: str,
+        entries: Iterable[CachedEntry],
+        now: dt.datetime,
+        bodies: Optional[Dict[str, str]] = None,
+    ) -> int:
+        # Returns the number of newly indexed entries. Bodies used here are
+        # removed from `bodies`.
+        rows = []
+        for title, link, author, ts, *_ in entries:
+            if not link or not title:
+                continue
+            published = _parse_rfc3339(ts) or now
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=dt.timezone.utc)
+            body = (bodies.pop(link, "") if bodies is not None else "")[: self.MAX_BODY]
+            rows.append(
+                (link, _lore_message_id(link), list_name, title, author, int(published.timestamp()), body)
+            )
+        with self.conn:
+            return self.conn.executemany(
+                "INSERT OR IGNORE INTO messages (link, message_id, list_name, subject, author, published, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            ).rowcount
+
+    def prune(self, max_age_seconds: float) -> int:
+        cutoff = int(time.time() - max_age_seconds)
+        with self.conn:
+            return self.conn.execute("DELETE FROM messages WHERE published < ?", (cutoff,)).rowcount
+
+    def search(
+        self,
+        query: str,
+        lists: Optional[List[str]] = None,
+        since: Optional[dt.datetime] = None,
+        limit: int = 50,
+    ) -> List[Tuple[str, str, str, str, dt.datetime]]:
+        # `query` is an FTS5 query. Returns (list, subject, link, author,
+        # published), newest first.
+        sql = (
+            "SELECT m.list_name, m.subject, m.link, m.author, m.published "
+            "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+            "WHERE messages_fts MATCH ?"
+        )
+        params: List[object] = [query]
+        if lists:
+            sql += " AND m.list_name IN (%s)" % ", ".join("?" for _ in lists)
+            params.extend(lists)
+        if since is not None:
+            sql += " AND m.published >= ?"
+            params.append(int(since.timestamp()))
+        sql += " ORDER BY m.published DESC LIMIT ?"
+        params.append(limit)
+        return [
+            (lst, subj, link, author, dt.datetime.fromtimestamp(ts, dt.timezone.utc))
+            for lst, subj, link, author, ts in self.conn.execute(sql, params)
+        ]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ItemCache:
+    """Classified FeedItems on disk, one JSON file per UTC day.
+
+    Every run stores the items it classified (before the seen-links filter),
+    so a long window is assembled from the day partitions plus a top-up
+    fetch of the part not covered yet. Per source, coverage.json records the
+    time spans that were fully fetched; the top-up starts where the
+    contiguous covered span from the window start ends.
+
+    Items depend on the area keywords and filters, so the whole cache is
+    dropped when they change (checked via a fingerprint). Partitions older
+    than retention_days are evicted.
+    """
+
+    def __init__(self, cache_dir: Path, fingerprint: str, retention_days: float = 35.0):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.retention_days = retention_days
+        self.coverage = self._load_coverage()
+
+    def _day_path(self, day: dt.date) -> Path:
+        return self.cache_dir / f"items-{day.isoformat()}.json"
+
+    def _load_coverage(self) -> Dict[str, List[List[int]]]:
+        try:
+            data = json.loads((self.cache_dir / "coverage.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("fingerprint") != self.fingerprint:
+            # Matching rules changed: cached items are stale.
+            for p in self.cache_dir.glob("items-*.json"):
+                p.unlink(missing_ok=True)
+            return {}
+        return data.get("sources") or {}
+
+    def _write_json(self, path: Path, data: Dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    def _read_day(self, day: dt.date) -> List[FeedItem]:
+        try:
+            data = json.loads(self._day_path(day).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        items = []
+        for row in data.get("items") or []:
+            area, list_name, title, link, author, ts = row[:6]
+            published = _parse_rfc3339(ts)
+            if published is not None:
+                parent = row[6] if len(row) > 6 else ""
+                items.append(FeedItem(area, list_name, title, link, author, published, parent=parent))
+        return items
+
+    @staticmethod
+    def _days(since: dt.datetime, now: dt.datetime) -> List[dt.date]:
+        first = since.astimezone(dt.timezone.utc).date()
+        last = now.astimezone(dt.timezone.utc).date()
+        return [first + dt.timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def covered_until(self, sources: Iterable[str], since: dt.datetime) -> dt.datetime:
+        # The latest time T such that every source was fully fetched over
+        # [since, T]; `since` itself if some source has no such span.
+        until = None
+        for source in sources:
+            end = int(since.timestamp())
+            for start, stop in sorted(self.coverage.get(source, [])):
+                if start <= end < stop:
+                    end = stop
+            until = end if until is None else min(until, end)
+        if until is None:
+            return since
+        return max(since, dt.datetime.fromtimestamp(until, dt.timezone.utc))
+
+    def record_coverage(self, sources: Iterable[str], start: dt.datetime, end: dt.datetime) -> None:
+        span = [int(start.timestamp()), int(end.timestamp())]
+        for source in sources:
+            merged: List[List[int]] = []
+            for a, b in sorted(self.coverage.get(source, []) + [span]):
+                if merged and a <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], b)
+                else:
+                    merged.append([a, b])
+            self.coverage[source] = merged
+        self._write_json(self.cache_dir / "coverage.json", {"fingerprint": self.fingerprint, "sources": self.coverage})
+
+    def add(self, items: Iterable[FeedItem]) -> None:
+        by_day: Dict[dt.date, List[FeedItem]] = {}
+        for it in items:
+            by_day.setdefault(it.published.astimezone(dt.timezone.utc).date(), []).append(it)
+        for day, new in by_day.items():
+            merged = {(it.area, it.link): it for it in self._read_day(day)}
+            before = len(merged)
+            for it in new:
+                merged.setdefault((it.area, it.link), it)
+            if len(merged) == before:
+                continue
+            rows = [
+                [it.area, it.list_name, it.title, it.link, it.author, it.published.isoformat(), it.parent]
+                for it in merged.values()
+            ]
+            self._write_json(self._day_path(day), {"items": rows})
+
+    def load(self, since: dt.datetime, now: dt.datetime) -> List[FeedItem]:
+        return [it for day in self._days(since, now) for it in self._read_day(day) if it.published >= since]
+
+    def evict(self) -> None:
+        if not self.cache_dir.is_dir():
+            return
+        cutoff = _utcnow() - dt.timedelta(days=self.retention_days)
+        for p in self.cache_dir.glob("items-*.json"):
+            try:
+                day = dt.date.fromisoformat(p.stem[len("items-") :])
+            except ValueError:
+                continue
+            if day < cutoff.date():
+                p.unlink(missing_ok=True)
+        limit = int(cutoff.timestamp())
+        self.coverage = {
+            src: [span for span in spans if span[1] >= limit] for src, spans in self.coverage.items()
+        }
+        self._write_json(self.cache_dir / "coverage.json", {"fingerprint": self.fingerprint, "sources": self.coverage})
+
+
+class RunMetrics:
+    """Timings and counters for one digest run.
+
+    Stage timings are wall-clock seconds. Feeds are fetched, parsed and
+    matched as a stream, so "ingest" covers the whole loop while "match" and
+    "index" are the parts of it spent in matching and indexing; the rest is
+    waiting for feeds. Per feed, latency, transferred bytes and parse time
+    tell network and parsing apart.
+
+    Written as JSON and as a Prometheus node_exporter textfile.
+    """
+
+    def __init__(self, list_names: Optional[Dict[str, str]] = None) -> None:
+        # list_names: feed source -> list name(s), used to label feeds
+        self.list_names = list_names or {}
+        self.started = time.time()
+        self._t0 = time.monotonic()
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.feeds: Dict[str, Dict[str, object]] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.monotonic() - t0
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def feed(
+        self,
+        source: str,
+        seconds: float,
+        entries: Optional[int],
+        nbytes: int = 0,
+        parse_seconds: float = 0.0,
+        not_modified: bool = False,
+    ) -> None:
+        # Called once per fetched page (several per feed with --backfill);
+        # entries=None records a failure.
+        m = self.feeds.setdefault(
+            source,
+            {"list": self.list_names.get(source, source), "requests": 0, "errors": 0, "not_modified": 0,
+             "seconds": 0.0, "bytes": 0, "parse_seconds": 0.0, "entries": 0},
+        )
+        m["requests"] += 1
+        m["seconds"] += seconds
+        m["bytes"] += nbytes
+        m["parse_seconds"] += parse_seconds
+        if entries is None:
+            m["errors"] += 1
+        else:
+            m["entries"] += entries
+        if not_modified:
+            m["not_modified"] += 1
+
+    def finish(self) -> None:
+        self.stages["total"] = time.monotonic() - self._t0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "started": dt.datetime.fromtimestamp(self.started, dt.timezone.utc).isoformat(),
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+            "feeds": self.feeds,
+        }
+
+    def prometheus(self) -> str:
+        def esc(v: object) -> str:
+            return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+        out: List[str] = []
+
+        def metric(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, object], float]]) -> None:
+            out.append(f"# HELP kernel_radar_{name} {help_text}")
+            out.append(f"# TYPE kernel_radar_{name} gauge")
+            for labels, value in samples:
+                lbl = ",".join(f'{k}="{esc(v)}"' for k, v in labels.items())
+                series = f"kernel_radar_{name}{{{lbl}}}" if lbl else f"kernel_radar_{name}"
+                out.append(f"{series} {float(value)!r}")
 
+        metric("last_run_timestamp_seconds", "Start time of the last digest run.", [({}, self.started)])
+        metric("stage_seconds", "Wall-clock seconds per pipeline stage.",
+               [({"stage": k}, v) for k, v in sorted(self.stages.items())])
+        metric("entries", "Entries and items counted at each pipeline stage.",
+               [({"stage": k}, v) for k, v in sorted(self.counters.items())])
+        feeds = sorted(self.feeds.items())
+        for key, name, help_text in (
+            ("seconds", "feed_fetch_seconds", "Total request latency for the feed."),
+            ("bytes", "feed_bytes", "Body bytes transferred for the feed."),
+            ("parse_seconds", "feed_parse_seconds", "Seconds spent parsing the feed."),
+            ("entries", "feed_entries", "Entries read from the feed."),
+            ("requests", "feed_requests", "Requests made for the feed."),
+            ("errors", "feed_errors", "Failed requests for the feed."),
+            ("not_modified", "feed_not_modified", "Requests answered 304 Not Modified."),
+        ):
+            metric(name, help_text, [({"list": m["list"], "source": src}, float(m[key])) for src, m in feeds])
+        return "\n".join(out) + "\n"
 
-def _render_markdown(now: dt.datetime, since_hours: int, items_by_area: Dict[str, List[FeedItem]]) -> str:
+
+def _write_metrics(cfg: Dict, state_file: Path, metrics: RunMetrics) -> None:
+    # metrics.json defaults to next to state_file; the textfile is opt-in.
+    # Both are replaced atomically so collectors never read a partial file.
+    metrics_cfg = cfg.get("metrics", {}) or {}
+    targets = [
+        (metrics_cfg.get("json", state_file.parent / "metrics.json"), lambda: json.dumps(metrics.as_dict(), indent=2)),
+        (metrics_cfg.get("textfile"), metrics.prometheus),
+    ]
+    for path, render in targets:
+        if not path:
+            continue
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(render(), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            print(f"WARN: failed to write metrics to {path}: {e}", file=sys.stderr)
+
+
+def _render_state_stats(stats: Dict[str, object]) -> str:
+    def when(ts: object) -> str:
+        if not isinstance(ts, int):
+            return "-"
+        return dt.datetime.fromtimestamp(ts, dt.timezone.utc).strftime("%Y-%m-%d %H:%MZ")
+
+    def rate(hits: object, lookups: object) -> str:
+        if not isinstance(hits, int) or not isinstance(lookups, int) or not lookups:
+            return "-"
+        return f"{100.0 * hits / lookups:.1f}% ({hits}/{lookups})"
+
+    lines = [
+        f"links: {stats['links']}",
+        f"db size: {stats['db_bytes']} bytes",
+        f"oldest entry: {when(stats['oldest_first_seen'])}",
+        f"newest entry: {when(stats['newest_first_seen'])}",
+        f"hit rate (last run): {rate(stats['last_hits'], stats['last_lookups'])}",
+        f"hit rate (all runs): {rate(stats['total_hits'], stats['total_lookups'])}",
+    ]
+    return "\n".join(lines)
+
+
+def _render_markdown(
+    now: dt.datetime,
+    since_hours: int,
+    items_by_area: Dict[str, List[FeedItem]],
+    coverage: Optional[Dict[str, str]] = None,
+) -> str:
     lines: List[str] = []
     lines.append(f"# Kernel radar digest")
     lines.append("")
     lines.append(f"Generated: {now.isoformat()}")
     lines.append(f"Window: last {since_hours}h")
+    if coverage is not None:
+        # list name -> why the window is not fully covered for that list
+        if not coverage:
+            lines.append("Coverage: complete")
+        else:
+            lines.append("Coverage: partial")
+            for name, why in sorted(coverage.items()):
+                lines.append(f"- {name}: {why}")
     lines.append("")
 
     total = sum(len(v) for v in items_by_area.values())
@@ -163,7 +1552,9 @@ def _render_markdown(now: dt.datetime, since_hours: int, items_by_area: Dict[str
         for it in sorted(items, key=lambda x: x.published, reverse=True):
             when = it.published.astimezone(dt.timezone.utc).strftime("%Y-%m-%d %H:%MZ")
             title = it.title.replace("\n", " ").strip()
-            lines.append(f"- {when} [{it.list_name}] {title}")
+            if it.messages > 1:
+                title += f" ({it.messages} messages)"
+            lines.append(f"- {when} [{it.lists}] {title}")
             lines.append(f"  - {it.link}")
             if it.author:
                 lines.append(f"  - {it.author}")
@@ -172,84 +1563,573 @@ def _render_markdown(now: dt.datetime, since_hours: int, items_by_area: Dict[str
     return "\n".join(lines)
 
 
-def main(argv: List[str]) -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True, help="Path to config.yaml")
-    ap.add_argument("--since-hours", type=int, default=24)
-    ap.add_argument("--out", default="-", help="Output file (default stdout)")
-    ap.add_argument("--include-seen", action="store_true", help="Do not dedupe using state")
-    args = ap.parse_args(argv)
+@dataclasses.dataclass
+class CompiledConfig:
+    """The parsed config plus everything derived from it alone."""
 
-    config_path = Path(args.config)
-    cfg = _load_yaml_minimal(config_path)
+    cfg: Dict
+    classifier: SubjectClassifier
+    registry: Dict[str, List[FeedSubscription]]
+    mirrors: Dict[str, PublicInboxMirror]
 
-    state_file = Path(cfg.get("state_file", "kernel_radar/state.json"))
-    state = _load_state(state_file)
-    seen_links = set(state.get("seen_links", []))
 
-    include_re = _compile_any(cfg.get("filters", {}).get("include_subject_regex", []))
-    exclude_re = _compile_any(cfg.get("filters", {}).get("exclude_subject_regex", []))
+COMPILED_CONFIG_VERSION = 1
 
-    now = _utcnow()
-    since = now - dt.timedelta(hours=args.since_hours)
 
-    items_by_area: Dict[str, List[FeedItem]] = {k: [] for k in (cfg.get("areas") or {}).keys()}
+def _compiled_config_path(config_path: Path, kind: str = "config") -> Path:
+    # Pickles refer to classes by module, so running the script (__main__)
+    # and importing it (kernel_radar, e.g. from the bench) keep separate files.
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    name = hashlib.sha1(f"{config_path.resolve()}\0{__name__}".encode("utf-8")).hexdigest()[:16]
+    return cache_home / "kernel_radar" / f"{kind}-{name}.pickle"
 
-    for area_name, area_cfg in (cfg.get("areas") or {}).items():
-        keywords = [k.lower() for k in (area_cfg.get("keywords") or [])]
-        lists = area_cfg.get("lists") or []
 
-        for lst in lists:
-            list_name = lst.get("name") or "unknown"
-            atom_url = lst.get("atom")
-            if not atom_url:
+def _compiled_key(raw: bytes) -> str:
+    # Compiled artifacts are valid while their input, this script and the
+    # artifact format are unchanged.
+    script = Path(__file__).stat()
+    return hashlib.sha256(
+        raw + f"\0{COMPILED_CONFIG_VERSION}:{script.st_mtime_ns}:{script.st_size}".encode("utf-8")
+    ).hexdigest()
+
+
+def _load_compiled(path: Path, key: str, kind: type, build: Callable[[], Any]) -> Any:
+    # Unpickle the artifact at `path` if it was built for `key`; otherwise
+    # build and store it. Anything unreadable is rebuilt.
+    try:
+        with path.open("rb") as f:
+            data = pickle.load(f)
+        if isinstance(data, dict) and data.get("key") == key and isinstance(data.get("compiled"), kind):
+            return data["compiled"]
+    except Exception:
+        pass
+
+    compiled = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(pickle.dumps({"key": key, "compiled": compiled}, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
+    except OSError as e:
+        print(f"WARN: failed to write compiled {kind.__name__} {path}: {e}", file=sys.stderr)
+    return compiled
+
+
+def _load_config(config_path: Path) -> CompiledConfig:
+    # Parsing YAML (and importing PyYAML) and building the classifier cost
+    # more than the rest of a cached run, so the result is pickled once per
+    # config file.
+    def build() -> CompiledConfig:
+        cfg = _load_yaml_minimal(config_path)
+        return CompiledConfig(
+            cfg=cfg,
+            classifier=_build_classifier(cfg),
+            registry=_feed_registry(cfg),
+            mirrors=_mirror_sources(cfg),
+        )
+
+    raw = config_path.read_bytes()
+    return _load_compiled(_compiled_config_path(config_path), _compiled_key(raw), CompiledConfig, build)
+
+
+def _load_maintainers(cfg: Dict) -> Optional[MaintainersIndex]:
+    # MAINTAINERS has thousands of sections; the index for the configured
+    # areas is built once per file content and area mapping, then pickled.
+    path_value = (cfg.get("maintainers", {}) or {}).get("file")
+    area_sections = {
+        name: list(area_cfg.get("maintainers") or [])
+        for name, area_cfg in (cfg.get("areas") or {}).items()
+        if (area_cfg or {}).get("maintainers")
+    }
+    if not path_value or not area_sections:
+        return None
+    path = Path(path_value).expanduser()
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        print(f"WARN: cannot read MAINTAINERS file {path}: {e}", file=sys.stderr)
+        return None
+    key = _compiled_key(raw + json.dumps(area_sections, sort_keys=True).encode("utf-8"))
+    return _load_compiled(
+        _compiled_config_path(path, "maintainers"),
+        key,
+        MaintainersIndex,
+        lambda: MaintainersIndex(raw.decode("utf-8", "replace"), area_sections),
+    )
+
+
+def _build_cache(cfg: Dict, state_file: Path, disabled: bool) -> Optional[FeedCache]:
+    cache_cfg = cfg.get("http_cache", {}) or {}
+    if disabled or not cache_cfg.get("enabled", True):
+        return None
+    return FeedCache(
+        Path(cache_cfg.get("dir") or state_file.parent / "http_cache"),
+        max_age_days=float(cache_cfg.get("max_age_days", 14)),
+        max_bytes=int(float(cache_cfg.get("max_mb", 64)) * 1024 * 1024),
+    )
+
+
+def _build_index(cfg: Dict, state_file: Path) -> Optional[MessageIndex]:
+    index_cfg = cfg.get("index", {}) or {}
+    if not index_cfg.get("enabled", True):
+        return None
+    path = Path(index_cfg.get("db") or state_file.parent / "index.sqlite")
+    try:
+        return MessageIndex(path)
+    except sqlite3.OperationalError as e:
+        # Typically an SQLite built without FTS5; the digest does not need
+        # the index, so run without it.
+        print(f"WARN: message index {path} unavailable, not indexing: {e}", file=sys.stderr)
+        return None
+
+
+def _build_item_cache(
+    cfg: Dict, state_file: Path, disabled: bool, maintainers: Optional[MaintainersIndex] = None
+) -> Optional[ItemCache]:
+    item_cfg = cfg.get("item_cache", {}) or {}
+    if disabled or not item_cfg.get("enabled", True):
+        return None
+    # Cached items are only valid for the matching rules that produced them,
+    # including the MAINTAINERS file and section mapping used for paths.
+    rules = {
+        "areas": cfg.get("areas") or {},
+        "filters": cfg.get("filters") or {},
+        "maintainers": maintainers.digest if maintainers else None,
+    }
+    fingerprint = hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()
+    return ItemCache(
+        Path(item_cfg.get("dir") or state_file.parent / "items"),
+        fingerprint,
+        retention_days=float(item_cfg.get("retention_days", 35)),
+    )
+
+
+def _list_label(subscribers: List[FeedSubscription], default: str) -> str:
+    return ", ".join(sorted({sub.list_name for sub in subscribers})) or default
+
+
+def _fetch_options(cfg: Dict) -> Dict[str, object]:
+    fetch_cfg = cfg.get("fetch", {}) or {}
+    return {
+        "max_workers": int(fetch_cfg.get("max_workers", 8)),
+        "per_host": int(fetch_cfg.get("per_host", 4)),
+        "budget_seconds": float(fetch_cfg.get("budget_seconds", 120)),
+        "timeout_seconds": int(fetch_cfg.get("timeout_seconds", 20)),
+    }
+
+
+def _result_entries(
+    res: FetchResult,
+    cache: Optional[FeedCache],
+    metrics: Optional["RunMetrics"] = None,
+    source: Optional[str] = None,
+) -> Optional[List[CachedEntry]]:
+    # Report fetch errors, keep the conditional-GET cache in sync and record
+    # per-feed metrics (under `source`, default the fetched url).
+    if metrics:
+        metrics.feed(
+            source or res.url,
+            res.elapsed,
+            None if res.entries is None else len(res.entries),
+            nbytes=res.bytes,
+            parse_seconds=res.parse_seconds,
+            not_modified=res.not_modified,
+        )
+    if res.entries is None:
+        print(f"WARN: failed to fetch {res.url}: {res.error}", file=sys.stderr)
+        return None
+    if cache:
+        if res.not_modified:
+            cache.touch(res.url)
+        else:
+            cache.store(res.url, res.etag, res.last_modified, res.entries, cutoff=res.cutoff, paths=res.paths)
+    return res.entries
+
+
+def _oldest_entry(entries: List[CachedEntry]) -> Optional[dt.datetime]:
+    times = [t for t in (_parse_rfc3339(e[3]) for e in entries) if t is not None]
+    if not times:
+        return None
+    return min(t if t.tzinfo else t.replace(tzinfo=dt.timezone.utc) for t in times)
+
+
+def _page_coverage(res: FetchResult, entries: List[CachedEntry], since: dt.datetime) -> Optional[str]:
+    # A single feed page covers the window if parsing stopped at the window
+    # or its oldest entry is older than the window start; otherwise older
+    # messages in the window were not on the page.
+    if res.cutoff is not None:
+        return None
+    oldest = _oldest_entry(entries)
+    if oldest is None or oldest <= since:
+        return None
+    return f"feed page only reaches back to {oldest.strftime('%Y-%m-%d %H:%MZ')} (try --backfill)"
+
+
+def _lore_inbox_base(atom_url: str) -> Optional[str]:
+    # https://lore.kernel.org/<list>/new.atom -> https://lore.kernel.org/<list>/
+    m = re.match(r"^(https?://[^/?#]+/[^/?#]+/)new\.atom$", atom_url)
+    return m.group(1) if m else None
+
+
+def _backfill_slices(since: dt.datetime, now: dt.datetime, slice_hours: float) -> List[Tuple[dt.datetime, dt.datetime]]:
+    # Newest first. Bounds are UTC multiples of the slice length, not offsets
+    # from `now`, so a slice's query URL is the same on every run: only the
+    # newest slice is still filling up, and closed slices are answered with
+    # 304s from the feed cache. The oldest slice may start before `since`;
+    # those entries are dropped by the window check when matching.
+    step = int(max(1.0, slice_hours) * 3600)
+    first = int(since.timestamp()) // step * step
+    end = -(-int(now.timestamp()) // step) * step
+    slices = []
+    while end > first:
+        slices.append(
+            (
+                dt.datetime.fromtimestamp(end - step, dt.timezone.utc),
+                dt.datetime.fromtimestamp(end, dt.timezone.utc),
+            )
+        )
+        end -= step
+    return slices
+
+
+def _backfill_query_url(base: str, start: dt.datetime, end: dt.datetime, offset: int) -> str:
+    # public-inbox search, newest first, as Atom (x=A); o= pages through results.
+    fmt = "%Y%m%d%H%M%S"
+    q = f"dt:{start.astimezone(dt.timezone.utc).strftime(fmt)}..{end.astimezone(dt.timezone.utc).strftime(fmt)}"
+    url = f"{base}?q={urllib.parse.quote(q)}&x=A"
+    if offset:
+        url += f"&o={offset}"
+    return url
+
+
+def _single_pages(
+    feed_urls: List[str],
+    since: dt.datetime,
+    cfg: Dict,
+    cache: Optional[FeedCache],
+    coverage: Dict[str, str],
+    metrics: Optional["RunMetrics"] = None,
+    bodies: Optional[Dict[str, str]] = None,
+    collect_paths: bool = False,
+) -> Iterator[Tuple[str, List[CachedEntry]]]:
+    # Default mode: the latest page of every feed, fetched concurrently.
+    # Entry bodies are collected into `bodies` (link -> text) if given, and
+    # patch paths into the entries with `collect_paths`.
+    opts = _fetch_options(cfg)
+    for res in _fetch_feeds(
+        feed_urls, cache=cache, since=since, collect_bodies=bodies is not None, collect_paths=collect_paths, **opts
+    ):
+        entries = _result_entries(res, cache, metrics)
+        if entries is None:
+            coverage[res.url] = "fetch failed"
+            continue
+        why = _page_coverage(res, entries, since)
+        if why:
+            coverage[res.url] = why
+        if bodies is not None and res.bodies:
+            bodies.update(res.bodies)
+        yield res.url, entries
+
+
+def _mirror_pages(
+    mirrors: Dict[str, PublicInboxMirror],
+    since: dt.datetime,
+    heads: Dict[str, str],
+    coverage: Dict[str, str],
+    bodies: Optional[Dict[str, str]] = None,
+    metrics: Optional["RunMetrics"] = None,
+    collect_paths: bool = False,
+) -> Iterator[Tuple[str, List[CachedEntry]]]:
+    # Lists read from local git mirrors: only commits after the last processed
+    # one (per epoch, in `heads`, updated in place), never older than `since`.
+    # Message bodies are collected into `bodies` (link -> text) if given, and
+    # patch paths into the entries with `collect_paths`.
+    for source, mirror in mirrors.items():
+        t0 = time.monotonic()
+        try:
+            entries, new_heads = mirror.read(heads, since=since, bodies=bodies, collect_paths=collect_paths)
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"WARN: failed to read mirror {mirror.path}: {e}", file=sys.stderr)
+            coverage[source] = "mirror read failed"
+            if metrics:
+                metrics.feed(source, time.monotonic() - t0, None)
+            continue
+        if metrics:
+            metrics.feed(source, time.monotonic() - t0, len(entries))
+        heads.update(new_heads)
+        yield source, entries
+
+
+def _backfill(
+    feed_urls: List[str],
+    since: dt.datetime,
+    now: dt.datetime,
+    cfg: Dict,
+    cache: Optional[FeedCache],
+    coverage: Dict[str, str],
+    metrics: Optional["RunMetrics"] = None,
+    bodies: Optional[Dict[str, str]] = None,
+    collect_paths: bool = False,
+) -> Iterator[Tuple[str, List[CachedEntry]]]:
+    # Cover a long window by splitting it into dated search queries per lore
+    # inbox and paging through each query until a short page comes back.
+    # Each round fetches every pending page concurrently; entries are merged
+    # per feed with dedupe on link and yielded as (feed url, new entries) as
+    # pages arrive. Feeds that could not be fully covered get a reason in
+    # `coverage` (keyed by feed url). Bodies of the new entries go into
+    # `bodies` if given; `collect_paths` as for _single_pages.
+    backfill_cfg = cfg.get("backfill", {}) or {}
+    slice_hours = float(backfill_cfg.get("slice_hours", 24))
+    page_size = int(backfill_cfg.get("page_size", 200))
+    max_pages = int(backfill_cfg.get("max_pages_per_slice", 20))
+    opts = _fetch_options(cfg)
+    deadline = time.monotonic() + float(opts["budget_seconds"])
+
+    # page url -> (feed url, slice, offset)
+    pending: Dict[str, Tuple[str, Optional[Tuple[dt.datetime, dt.datetime]], int]] = {}
+    for feed_url in feed_urls:
+        base = _lore_inbox_base(feed_url)
+        if base is None:
+            # Not a lore inbox feed: nothing to page through.
+            pending[feed_url] = (feed_url, None, 0)
+            continue
+        for sl in _backfill_slices(since, now, slice_hours):
+            pending[_backfill_query_url(base, sl[0], sl[1], 0)] = (feed_url, sl, 0)
+
+    merged: Dict[str, Set[str]] = {url: set() for url in feed_urls}
+    while pending:
+        opts["budget_seconds"] = max(0.0, deadline - time.monotonic())
+        next_pending: Dict[str, Tuple[str, Optional[Tuple[dt.datetime, dt.datetime]], int]] = {}
+        for res in _fetch_feeds(
+            list(pending),
+            cache=cache,
+            since=since,
+            collect_bodies=bodies is not None,
+            collect_paths=collect_paths,
+            **opts,
+        ):
+            feed_url, sl, offset = pending[res.url]
+            entries = _result_entries(res, cache, metrics, source=feed_url)
+            if entries is None:
+                coverage[feed_url] = "some backfill pages failed to fetch"
                 continue
 
-            try:
-                xml_text = _read_text_url(atom_url)
-            except Exception as e:
-                print(f"WARN: failed to fetch {atom_url}: {e}", file=sys.stderr)
+            seen = merged[feed_url]
+            fresh = [e for e in entries if e[1] not in seen]
+            seen.update(e[1] for e in fresh)
+            if bodies is not None and res.bodies:
+                bodies.update((e[1], res.bodies[e[1]]) for e in fresh if e[1] in res.bodies)
+            yield feed_url, fresh
+
+            if sl is None:
+                why = _page_coverage(res, entries, since)
+                if why:
+                    coverage[feed_url] = why
+            elif len(entries) >= page_size:
+                if offset // page_size + 1 >= max_pages:
+                    coverage[feed_url] = f"more than {max_pages} pages in a {slice_hours:g}h slice"
+                else:
+                    base = _lore_inbox_base(feed_url) or ""
+                    next_url = _backfill_query_url(base, sl[0], sl[1], offset + page_size)
+                    next_pending[next_url] = (feed_url, sl, offset + page_size)
+        pending = next_pending
+
+
+def _match_entries(
+    entries: Iterable[CachedEntry],
+    subscribers: List[FeedSubscription],
+    classifier: SubjectClassifier,
+    seen_links: Optional[SeenStore],
+    now: dt.datetime,
+    since: dt.datetime,
+    metrics: Optional["RunMetrics"] = None,
+    maintainers: Optional[MaintainersIndex] = None,
+) -> Iterator[FeedItem]:
+    # Each feed is parsed once; every entry is fanned out to all areas
+    # subscribed to this feed. seen_links=None disables dedupe. With
+    # `maintainers`, areas mapped to MAINTAINERS sections are decided by the
+    # paths recorded on a patch entry, and by subject keywords otherwise.
+    count = metrics.count if metrics else (lambda name, n=1: None)
+    for title, link, author, ts, parent, paths in entries:
+        count("entries")
+        if not link or not title:
+            count("dropped_invalid")
+            continue
+
+        published = _parse_rfc3339(ts) or now
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=dt.timezone.utc)
+
+        if published < since:
+            count("dropped_outside_window")
+            continue
+
+        subj = title
+
+        # subject filters + area keywords in one pass
+        verdict = classifier.classify(subj)
+        if not verdict.accepted:
+            count("dropped_filtered")
+            continue
+
+        areas = verdict.areas
+        if maintainers is not None and paths:
+            count("classified_by_path")
+            areas = (areas - maintainers.mapped_areas) | maintainers.areas(paths)
+
+        # a patch series is tracked in state as one unit
+        if seen_links is not None and (_series_anchor(subj, link, parent) or link) in seen_links:
+            count("dropped_seen")
+            continue
+
+        matched = False
+        for sub in subscribers:
+            if sub.area not in areas:
                 continue
 
-            for title, link, author, ts in _atom_items(xml_text):
-                if not link or not title:
-                    continue
+            matched = True
+            count("matched_items")
+            yield FeedItem(
+                area=sub.area,
+                list_name=sub.list_name,
+                title=subj,
+                link=link,
+                author=author,
+                published=published,
+                parent=parent,
+            )
+        if not matched:
+            count("dropped_no_area")
 
-                published = _parse_rfc3339(ts) or now
-                if published.tzinfo is None:
-                    published = published.replace(tzinfo=dt.timezone.utc)
 
-                if published < since:
-                    continue
+_PATCH_TAGS_RE = re.compile(r"^\s*\[([^\]]*\bPATCH\b[^\]]*)\]", re.IGNORECASE)
+_SERIES_NUM_RE = re.compile(r"\b(\d+)\s*/\s*(\d+)\b")
+_SERIES_VERSION_RE = re.compile(r"\bv(\d+)\b", re.IGNORECASE)
 
-                subj = title
-                subj_l = subj.lower()
 
-                # subject filters
-                if include_re and not _matches_any(subj, include_re):
-                    continue
-                if exclude_re and _matches_any(subj, exclude_re):
-                    continue
+def _series_position(subject: str) -> Optional[Tuple[int, int, int]]:
+    # "[PATCH v3 07/20] ..." -> (3, 7, 20); "[PATCH 0/4]" is the cover letter.
+    # None for single patches, replies ("Re: ...") and non-patch mail.
+    m = _PATCH_TAGS_RE.match(subject)
+    if not m:
+        return None
+    nm = _SERIES_NUM_RE.search(m.group(1))
+    if not nm:
+        return None
+    n, total = int(nm.group(1)), int(nm.group(2))
+    if total < 2 and n != 0:
+        return None
+    version = _SERIES_VERSION_RE.search(m.group(1))
+    return (int(version.group(1)) if version else 1, n, total)
 
-                # area keyword match
-                if keywords and not any(k in subj_l for k in keywords):
-                    continue
 
-                if not args.include_seen and link in seen_links:
-                    continue
+def _series_anchor(subject: str, link: str, parent: str) -> Optional[str]:
+    # The link a whole series is known by: the cover letter, or the first
+    # patch when there is none. git send-email threads every patch under
+    # it, so a later patch's parent is the anchor. The parents of the cover
+    # letter and of patch 1 are ignored: they point at an earlier version's
+    # thread when a re-roll is sent with --in-reply-to. Patch 1 of a series
+    # with a cover letter is only tied to it by _series_anchors.
+    pos = _series_position(subject)
+    if pos is None:
+        return None
+    if pos[1] <= 1 or not parent:
+        return link
+    return parent
 
-                items_by_area.setdefault(area_name, []).append(
-                    FeedItem(
-                        area=area_name,
-                        list_name=list_name,
-                        title=subj,
-                        link=link,
-                        author=author,
-                        published=published,
-                    )
-                )
 
-    # apply limits
+def _series_anchors(items: Iterable[FeedItem]) -> Dict[str, str]:
+    # Message-ID -> series anchor link for the series messages in `items`.
+    # Unlike _series_anchor, parents found among `items` are followed while
+    # they are earlier patches of the same version of the series, so patch 1
+    # joins its cover letter and --chain-reply-to threads (each patch a reply
+    # to the previous one) group too. A chain is only followed as far as its
+    # messages are present; a patch whose predecessor is missing falls back
+    # to _series_anchor.
+    by_key: Dict[str, Tuple[FeedItem, Tuple[int, int, int]]] = {}
+    for it in items:
+        pos = _series_position(it.title)
+        if pos is not None:
+            by_key.setdefault(_message_key(it.link), (it, pos))
+    anchors: Dict[str, str] = {}
+    for key, (it, pos) in by_key.items():
+        cur, cur_pos = it, pos
+        while cur.parent and cur_pos[1] > 0:
+            found = by_key.get(_message_key(cur.parent))
+            if found is None:
+                break
+            parent, parent_pos = found
+            if (parent_pos[0], parent_pos[2]) != (pos[0], pos[2]) or parent_pos[1] >= cur_pos[1]:
+                break
+            cur, cur_pos = parent, parent_pos
+        anchors[key] = _series_anchor(cur.title, cur.link, cur.parent) or cur.link
+    return anchors
+
+
+def _group_series(items: List[FeedItem], anchors: Optional[Dict[str, str]] = None) -> List[FeedItem]:
+    # Collapse the messages of each patch series into one item: the cover
+    # letter (or lowest-numbered patch present), linked to the series anchor.
+    # Anchors are compared by Message-ID, so a cross-posted series whose
+    # patches were kept from different lists still groups together.
+    # `anchors` (from _series_anchors) may cover a larger set than `items`.
+    if anchors is None:
+        anchors = _series_anchors(items)
+    out: List[FeedItem] = []
+    series: Dict[str, List[Tuple[str, FeedItem]]] = {}
+    for it in items:
+        anchor = anchors.get(_message_key(it.link))
+        if anchor is None:
+            out.append(it)
+        else:
+            series.setdefault(_message_key(anchor), []).append((anchor, it))
+    for members in series.values():
+        anchor, head = min(members, key=lambda m: ((_series_position(m[1].title) or (0, 0, 0))[1], m[1].published))
+        lists = {name for _, it in members for name in (it.list_name,) + it.also_on} - {head.list_name}
+        out.append(
+            dataclasses.replace(
+                head,
+                link=anchor,
+                published=min(it.published for _, it in members),
+                messages=len({_message_key(it.link) for _, it in members}),
+                also_on=tuple(sorted(lists)),
+            )
+        )
+    return out
+
+
+def _list_rank(registry: Dict[str, List[FeedSubscription]]) -> Dict[str, int]:
+    # List name -> position of its first appearance in the config.
+    rank: Dict[str, int] = {}
+    for subs in registry.values():
+        for sub in subs:
+            rank.setdefault(sub.list_name, len(rank))
+    return rank
+
+
+def _merge_crosspost(
+    items: Dict[Tuple[str, str], FeedItem], it: FeedItem, rank: Optional[Dict[str, int]] = None
+) -> bool:
+    # Add `it` under (area, Message-ID). Copies of one message are merged
+    # into a single item; the copy from the list that comes first in `rank`
+    # (see _list_rank) provides the link, so the digest does not depend on
+    # which feed was fetched first. Returns True if `it` is new.
+    key = (it.area, _message_key(it.link))
+    prev = items.get(key)
+    if prev is None:
+        items[key] = it
+        return True
+    rank = rank or {}
+
+    def order(name: str) -> Tuple[int, str]:
+        return rank.get(name, len(rank)), name
+
+    primary = it if order(it.list_name) < order(prev.list_name) else prev
+    lists = {prev.list_name, it.list_name, *prev.also_on, *it.also_on} - {primary.list_name}
+    items[key] = dataclasses.replace(primary, also_on=tuple(sorted(lists, key=order)))
+    return False
+
+
+def _apply_limits(cfg: Dict, items_by_area: Dict[str, List[FeedItem]]) -> Dict[str, List[FeedItem]]:
     limits = cfg.get("limits", {}) or {}
     max_per_area = int(limits.get("max_items_per_area", 40))
     max_total = int(limits.get("max_total_items", 200))
@@ -267,23 +2147,449 @@ def main(argv: List[str]) -> int:
     keep_links = {it.link for it in all_items}
     for area in list(trimmed.keys()):
         trimmed[area] = [it for it in trimmed[area] if it.link in keep_links]
+    return trimmed
+
+
+@dataclasses.dataclass
+class FeedSchedule:
+    """Polling schedule for one feed in --daemon mode.
+
+    The interval adapts to the feed's observed post rate so that a poll
+    sees roughly `target_new` new entries: LKML ends up near the minimum
+    interval, quiet lists like containers near the maximum.
+    """
+
+    url: str
+    interval: float
+    next_due: float = 0.0
+    rate: Optional[float] = None  # smoothed new entries per second
+    last_poll: Optional[float] = None
+    last_links: Set[str] = dataclasses.field(default_factory=set)
+
+    def observe(
+        self,
+        entries: List[CachedEntry],
+        now: dt.datetime,
+        min_interval: float,
+        max_interval: float,
+        target_new: float,
+    ) -> None:
+        mono = time.monotonic()
+        links = {e[1] for e in entries if e[1]}
+        new = len(links - self.last_links)
+
+        # Post rate implied by the page itself: entries over the time span
+        # they cover. Used to seed the estimate and when the page overflowed
+        # between polls (every entry new, so some were probably missed).
+        times = [t for t in (_parse_rfc3339(e[3]) for e in entries) if t is not None]
+        times = [t if t.tzinfo else t.replace(tzinfo=dt.timezone.utc) for t in times]
+        page_rate = 0.0
+        if times:
+            span = max(60.0, (now - min(times)).total_seconds())
+            page_rate = len(times) / span
+
+        if self.last_poll is None:
+            sample = page_rate
+        else:
+            sample = new / max(1.0, mono - self.last_poll)
+            if links and new >= len(links):
+                sample = max(sample, page_rate)
+        self.rate = sample if self.rate is None else 0.5 * sample + 0.5 * self.rate
+
+        interval = target_new / self.rate if self.rate else max_interval
+        self.interval = min(max_interval, max(min_interval, interval))
+        self.last_poll = mono
+        self.last_links = links
+        self.next_due = mono + self.interval
+
+
+def _write_digest(out: str, text: str, now: dt.datetime) -> Path:
+    # --out may contain strftime fields (e.g. reports/kernel-digest-%Y-%m-%d.md)
+    path = Path(now.strftime(out))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def _run_daemon(
+    args: argparse.Namespace,
+    cfg: Dict,
+    registry: Dict[str, List[FeedSubscription]],
+    mirrors: Dict[str, PublicInboxMirror],
+    classifier: SubjectClassifier,
+    seen_links: SeenStore,
+    cache: Optional[FeedCache],
+    index: Optional[MessageIndex],
+    item_cache: Optional[ItemCache],
+    maintainers: Optional[MaintainersIndex],
+) -> int:
+    # Long-running mode: config, compiled classifier, state and cache stay in
+    # memory; each feed is polled on its own adaptive schedule. The digest for
+    # the rolling --since-hours window is rewritten whenever new items arrive
+    # (or, with --out -, each new item is printed as it is found).
+    daemon_cfg = cfg.get("daemon", {}) or {}
+    min_interval = float(daemon_cfg.get("min_interval_minutes", 5)) * 60
+    max_interval = float(daemon_cfg.get("max_interval_minutes", 240)) * 60
+    target_new = float(daemon_cfg.get("target_new_per_poll", 10))
+    fetch_opts = _fetch_options(cfg)
+    window = dt.timedelta(hours=args.since_hours)
+    ttl_hours = max(float(cfg.get("state_ttl_days", 30)) * 24, args.since_hours)
+    index_cfg = cfg.get("index", {}) or {}
+    index_retention = float(index_cfg.get("retention_days", MessageIndex.RETENTION_DAYS)) * 86400
+
+    stop = threading.Event()
+
+    def on_signal(signum, frame) -> None:
+        stop.set()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    schedules = {url: FeedSchedule(url=url, interval=min_interval) for url in registry}
+    # (area, Message-ID) -> item, for everything in the current window,
+    # including items already reported: the digest is rewritten from it, and
+    # seen-state only decides what counts as new. After a restart it is
+    # seeded from the item cache, so today's digest keeps what it showed.
+    window_items: Dict[Tuple[str, str], FeedItem] = {}
+    list_rank = _list_rank(registry)
+    if item_cache:
+        start = _utcnow()
+        for it in item_cache.load(start - window, start):
+            _merge_crosspost(window_items, it, list_rank)
+    heads = {} if args.include_seen else seen_links.mirror_heads()
+    bodies: Optional[Dict[str, str]] = {} if index or maintainers else None
+    next_maintenance = time.monotonic() + 3600
+
+    print(f"INFO: daemon started with {len(schedules)} feeds", file=sys.stderr)
+    while not stop.is_set():
+        mono = time.monotonic()
+        due = [url for url, sch in schedules.items() if sch.next_due <= mono]
+        if due:
+            now = _utcnow()
+            since = now - window
+            # items added to the window by this poll, reported or not
+            added: List[FeedItem] = []
+
+            def collect(source: str, entries: List[CachedEntry]) -> None:
+                for it in _match_entries(
+                    entries, registry.get(source, []), classifier, None, now, since, maintainers=maintainers
+                ):
+                    if _merge_crosspost(window_items, it, list_rank):
+                        added.append(it)
+                if index:
+                    index.add(_list_label(registry.get(source, []), source), entries, now, bodies)
+                # bodies are only needed for the page they came with
+                if bodies:
+                    bodies.clear()
+
+            # Local mirrors only yield commits since the last poll and are
+            # cheap to read, so they are polled at the minimum interval.
+            mirror_due = {url: mirrors[url] for url in due if url in mirrors}
+            for source, entries in _mirror_pages(
+                mirror_due, since, heads, {}, bodies, collect_paths=maintainers is not None
+            ):
+                collect(source, entries)
+            for url in mirror_due:
+                schedules[url].next_due = time.monotonic() + min_interval
+            if mirror_due and not args.include_seen:
+                seen_links.set_mirror_heads(heads)
+
+            http_due = [url for url in due if url not in mirrors]
+            for res in _fetch_feeds(
+                http_due,
+                cache=cache,
+                since=since,
+                collect_bodies=bodies is not None,
+                collect_paths=maintainers is not None,
+                **fetch_opts,
+            ):
+                sch = schedules[res.url]
+                entries = _result_entries(res, cache)
+                if entries is None:
+                    sch.next_due = time.monotonic() + sch.interval
+                    continue
+                if bodies is not None and res.bodies:
+                    bodies.update(res.bodies)
+                sch.observe(entries, now, min_interval, max_interval, target_new)
+                collect(res.url, entries)
+
+            for key in [k for k, it in window_items.items() if it.published < since]:
+                del window_items[key]
+
+            if added:
+                if item_cache:
+                    item_cache.add(added)
+                items_by_area: Dict[str, List[FeedItem]] = {k: [] for k in (cfg.get("areas") or {}).keys()}
+                for it in window_items.values():
+                    items_by_area.setdefault(it.area, []).append(it)
+                anchors = _series_anchors(window_items.values())
+                items_by_area = {area: _group_series(items, anchors) for area, items in items_by_area.items()}
+                trimmed = _apply_limits(cfg, items_by_area)
+                # Message-IDs of shown items, or of series anchors for grouped series
+                shown = {_message_key(it.link): it for area_items in trimmed.values() for it in area_items}
+                new_keys: Dict[str, FeedItem] = {}
+                for it in sorted(added, key=lambda x: x.published):
+                    # patch series are tracked in state by their anchor
+                    key = _message_key(anchors.get(_message_key(it.link), it.link))
+                    if key in shown and (args.include_seen or key not in seen_links):
+                        new_keys.setdefault(key, shown[key])
+
+                if args.out == "-":
+                    for it in new_keys.values():
+                        when = it.published.astimezone(dt.timezone.utc).strftime("%Y-%m-%d %H:%MZ")
+                        print(f"- {when} [{it.area}] [{it.lists}] {it.title.strip()}")
+                        print(f"  - {it.link}", flush=True)
+                else:
+                    text = _render_markdown(now=now, since_hours=args.since_hours, items_by_area=trimmed)
+                    path = _write_digest(args.out, text, now)
+                    print(f"INFO: {len(new_keys)} new items; wrote {path}", file=sys.stderr)
+
+                if not args.include_seen:
+                    seen_links.add_many(it.link for it in new_keys.values())
+                    seen_links.record_run()
+
+        if time.monotonic() >= next_maintenance:
+            seen_links.compact(ttl_hours * 3600)
+            if cache:
+                cache.evict()
+            if index and index_retention:
+                index.prune(index_retention)
+            if item_cache:
+                item_cache.evict()
+            next_maintenance = time.monotonic() + 3600
+
+        wake = min(sch.next_due for sch in schedules.values()) if schedules else time.monotonic() + 60
+        stop.wait(max(1.0, wake - time.monotonic()))
 
-    out_text = _render_markdown(now=now, since_hours=args.since_hours, items_by_area=trimmed)
+    print("INFO: daemon stopping", file=sys.stderr)
+    seen_links.close()
+    if index:
+        index.close()
+    return 0
+
+
+def _fts_query(terms: List[str]) -> str:
+    # Plain search terms: each term is a quoted phrase (so drm/amd or
+    # gfx11.5 need no FTS syntax), all terms must match.
+    return " ".join('"%s"' % t.replace('"', '""') for t in terms)
+
+
+def _search_main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(
+        prog="kernel_radar.py search", description="Search the local index of ingested messages"
+    )
+    ap.add_argument("--config", required=True, help="Path to config.yaml")
+    ap.add_argument("terms", nargs="+", help="Search terms (subject, author and body; all must match)")
+    ap.add_argument("--list", action="append", dest="lists", help="Only this list (repeatable)")
+    ap.add_argument("--since-days", type=float, help="Only messages from the last N days")
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--fts", action="store_true", help="Pass the terms through as a raw FTS5 query")
+    args = ap.parse_args(argv)
+
+    cfg = _load_config(Path(args.config)).cfg
+    state_file = Path(cfg.get("state_file", "kernel_radar/state.json"))
+    index = _build_index(cfg, state_file)
+    if index is None:
+        print("ERROR: the message index is disabled (index.enabled: false) or unavailable", file=sys.stderr)
+        return 2
+
+    query = " ".join(args.terms) if args.fts else _fts_query(args.terms)
+    since = _utcnow() - dt.timedelta(days=args.since_days) if args.since_days else None
+    try:
+        hits = index.search(query, lists=args.lists, since=since, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"ERROR: bad query {query!r}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        index.close()
+
+    for list_name, subject, link, author, published in hits:
+        print(f"- {published.strftime('%Y-%m-%d %H:%MZ')} [{list_name}] {subject}")
+        print(f"  - {link}")
+        if author:
+            print(f"  - {author}")
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    if argv and argv[0] == "search":
+        return _search_main(argv[1:])
+
+    ap = argparse.ArgumentParser(epilog="Use 'kernel_radar.py search --help' to query the message index.")
+    ap.add_argument("--config", required=True, help="Path to config.yaml")
+    ap.add_argument("--since-hours", type=int, default=24)
+    ap.add_argument("--out", default="-", help="Output file (default stdout)")
+    ap.add_argument("--include-seen", action="store_true", help="Do not dedupe using state")
+    ap.add_argument("--no-http-cache", action="store_true", help="Always do a full GET of every feed")
+    ap.add_argument(
+        "--no-item-cache",
+        action="store_true",
+        help="Fetch the whole window instead of reusing items classified by earlier runs",
+    )
+    ap.add_argument("--state-stats", action="store_true", help="Print dedupe state statistics and exit")
+    ap.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Cover the whole --since-hours window by paging through dated lore search "
+        "feeds instead of reading only the latest new.atom page",
+    )
+    ap.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll each feed on its own adaptive interval; "
+        "--out is rewritten as new items arrive (strftime fields allowed)",
+    )
+    args = ap.parse_args(argv)
+    metrics = RunMetrics()
 
-    if args.out == "-":
-        print(out_text)
+    config_path = Path(args.config)
+    with metrics.stage("config"):
+        compiled = _load_config(config_path)
+    cfg = compiled.cfg
+
+    state_file = Path(cfg.get("state_file", "kernel_radar/state.json"))
+    state_db = Path(cfg.get("state_db") or state_file.with_suffix(".sqlite"))
+    with metrics.stage("state_load"):
+        seen_links = SeenStore(state_db, legacy_json=state_file)
+
+    if args.state_stats:
+        print(_render_state_stats(seen_links.stats()))
+        seen_links.close()
+        return 0
+
+    classifier = compiled.classifier
+    registry = compiled.registry
+    mirrors = compiled.mirrors
+    cache = _build_cache(cfg, state_file, disabled=args.no_http_cache)
+    index = _build_index(cfg, state_file)
+    with metrics.stage("config"):
+        maintainers = _load_maintainers(cfg)
+    item_cache = _build_item_cache(cfg, state_file, disabled=args.no_item_cache, maintainers=maintainers)
+
+    if args.daemon:
+        return _run_daemon(
+            args, cfg, registry, mirrors, classifier, seen_links, cache, index, item_cache, maintainers
+        )
+
+    now = _utcnow()
+    since = now - dt.timedelta(hours=args.since_hours)
+    metrics.list_names = {url: _list_label(subs, url) for url, subs in registry.items()}
+
+    items_by_area: Dict[str, List[FeedItem]] = {k: [] for k in (cfg.get("areas") or {}).keys()}
+    # feed url -> reason the window is not fully covered
+    coverage: Dict[str, str] = {}
+    # Items from earlier runs are reused; only the part of the window they
+    # do not cover is fetched.
+    fetch_since = item_cache.covered_until(registry, since) if item_cache else since
+
+    # mirror epoch -> last processed commit; --include-seen rereads the window
+    with metrics.stage("state_load"):
+        heads = {} if args.include_seen else seen_links.mirror_heads()
+    feed_urls = [url for url in registry if url not in mirrors]
+    # link -> message body (local mirrors, and Atom <content> of fetched
+    # pages) for the index; mirrors also need it to record patch paths
+    bodies: Optional[Dict[str, str]] = {} if index or maintainers else None
+
+    feeds: Iterator[Tuple[str, List[CachedEntry]]]
+    # patch paths are only needed to classify by MAINTAINERS
+    paths = maintainers is not None
+    if args.backfill:
+        feeds = _backfill(feed_urls, fetch_since, now, cfg, cache, coverage, metrics, bodies, paths)
     else:
-        Path(args.out).write_text(out_text, encoding="utf-8")
+        feeds = _single_pages(feed_urls, fetch_since, cfg, cache, coverage, metrics, bodies, paths)
+    feeds = itertools.chain(_mirror_pages(mirrors, fetch_since, heads, coverage, bodies, metrics, paths), feeds)
+
+    fresh: List[FeedItem] = []
+    with metrics.stage("ingest"):
+        for feed_url, entries in feeds:
+            with metrics.stage("match"):
+                fresh.extend(
+                    _match_entries(
+                        entries, registry.get(feed_url, []), classifier, None, now, since, metrics, maintainers
+                    )
+                )
+            if index:
+                with metrics.stage("index"):
+                    index.add(_list_label(registry.get(feed_url, []), feed_url), entries, now, bodies)
+            # bodies are only needed for the page they came with
+            if bodies:
+                bodies.clear()
+
+    # (area, Message-ID) -> item, one per message with every list it was
+    # seen on; dedupe against state once per message
+    window_items: Dict[Tuple[str, str], FeedItem] = {}
+    list_rank = _list_rank(registry)
+    cached: List[FeedItem] = []
+    if item_cache:
+        with metrics.stage("item_cache"):
+            item_cache.add(fresh)
+            item_cache.record_coverage([url for url in registry if url not in coverage], fetch_since, now)
+            cached = item_cache.load(since, now)
+    for it in itertools.chain(fresh, cached):
+        _merge_crosspost(window_items, it, list_rank)
+    metrics.count("cached_items", len(window_items) - len({(it.area, _message_key(it.link)) for it in fresh}))
+    metrics.count("merged_crossposts", sum(len(it.also_on) for it in window_items.values()))
+    anchors = _series_anchors(window_items.values())
+    seen: Dict[str, bool] = {}
+    with metrics.stage("dedupe"):
+        for it in window_items.values():
+            if not args.include_seen:
+                # patch series are tracked in state by their anchor
+                key = _message_key(anchors.get(_message_key(it.link), it.link))
+                if key not in seen:
+                    seen[key] = key in seen_links
+                if seen[key]:
+                    metrics.count("dropped_seen")
+                    continue
+            items_by_area.setdefault(it.area, []).append(it)
+    ungrouped = sum(len(v) for v in items_by_area.values())
+    items_by_area = {area: _group_series(items, anchors) for area, items in items_by_area.items()}
+    metrics.count("merged_into_series", ungrouped - sum(len(v) for v in items_by_area.values()))
+
+    trimmed = _apply_limits(cfg, items_by_area)
+    shown = sum(len(v) for v in trimmed.values())
+    metrics.count("dropped_limits", sum(len(v) for v in items_by_area.values()) - shown)
+    metrics.count("digest_items", shown)
+
+    with metrics.stage("cleanup"):
+        if cache:
+            cache.evict()
+        if item_cache:
+            item_cache.evict()
+
+    with metrics.stage("render"):
+        coverage_by_list = {_list_label(registry.get(url, []), url): why for url, why in coverage.items()}
+        out_text = _render_markdown(
+            now=now, since_hours=args.since_hours, items_by_area=trimmed, coverage=coverage_by_list
+        )
+
+        if args.out == "-":
+            print(out_text)
+        else:
+            Path(args.out).write_text(out_text, encoding="utf-8")
 
     # update state
-    if not args.include_seen:
-        new_seen = set(seen_links)
-        for area_items in trimmed.values():
-            for it in area_items:
-                new_seen.add(it.link)
-        state["seen_links"] = sorted(new_seen)
-        _save_state(state_file, state)
+    with metrics.stage("state_save"):
+        if not args.include_seen:
+            seen_links.add_many(it.link for area_items in trimmed.values() for it in area_items)
+            seen_links.set_mirror_heads(heads)
+            seen_links.record_run()
+            # Never drop links that could still show up in this run's window.
+            ttl_hours = max(float(cfg.get("state_ttl_days", 30)) * 24, args.since_hours)
+            seen_links.compact(ttl_hours * 3600)
+        seen_links.close()
+
+    if index:
+        with metrics.stage("cleanup"):
+            retention_days = float((cfg.get("index", {}) or {}).get("retention_days", MessageIndex.RETENTION_DAYS))
+            if retention_days:
+                index.prune(retention_days * 86400)
+            index.close()
 
+    metrics.finish()
+    _write_metrics(cfg, state_file, metrics)
     return 0
 
 
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Benchmark kernel_radar.py against synthetic lore feeds served locally.
+
+Why
+---
+Real runs depend on lore.kernel.org, so timings are neither reproducible
+nor comparable between changes. This harness has three parts:
+- a generator for synthetic lore-style Atom feeds (any size, newest first)
+- a local HTTP server that serves them with a configurable per-request latency
+  (HTTP/1.1 keep-alive, optional gzip)
+- scenario runs of the real `kernel_radar.py` in a subprocess against that server
+
+Each scenario runs with a fresh state dir, the HTTP/item caches and the
+message index off, and reports throughput (feed entries per second of wall
+time), peak RSS of the kernel_radar process, and the stage breakdown from
+its metrics.json (parse, match, state).
+
+Scenarios
+---------
+- many-lists:   50 lists, 4 areas
+- many-areas:   4 lists, 200 areas with 10 keywords each
+- large-state:  4 lists, seen-state pre-filled with --state-links links
+                (half of the feed links are already seen)
+- long-window:  1 list with 20x --entries entries over a 30-day window
+
+Usage
+-----
+  ./tools/bench_kernel_radar.py
+  ./tools/bench_kernel_radar.py --scenario many-lists --entries 1000 --latency-ms 50
+  ./tools/bench_kernel_radar.py --entries 20000 --repeat 3 --json bench.json
+  ./tools/bench_kernel_radar.py --serve --entries 100000   # serve feeds only, until Ctrl-C
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gzip
+import http.server
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+import kernel_radar  # noqa: E402
+
+SUBSYSTEMS = [
+    "sched/fair", "sched/deadline", "sched/psi", "mm", "mm/slub", "mm/memcg", "cgroup", "cgroup/cpuset",
+    "drm/amd/display", "drm/amdgpu", "drm/i915", "drm/xe", "net", "net/sched", "bpf", "fs/ext4", "btrfs",
+    "xfs", "io_uring", "block", "nvme", "rcu", "locking", "x86/mm", "arm64", "kvm", "usb", "hid", "iio",
+]
+WORDS = [
+    "fix", "avoid", "use-after-free", "deadlock", "race", "regression", "leak", "warning", "crash",
+    "latency", "load balance", "uclamp", "EEVDF", "smu", "kfd", "gfx11", "firmware", "namespace", "userns",
+    "cleanup", "refactor", "support", "handle", "error", "path", "lock", "counter", "overflow", "timeout",
+    "reset", "memory.max", "io.max", "psi", "deadline", "util", "display", "dc", "rt", "migrate", "queue",
+]
+AREA_KEYWORDS = {
+    "scheduler": ["sched", "CFS", "EEVDF", "rt", "deadline", "load balance", "uclamp", "psi", "latency"],
+    "amdgpu": ["amdgpu", "drm/amd", "dri", "gfx11", "smu", "kfd", "dc", "display", "firmware"],
+    "cgroups": ["cgroup", "cgroup2", "memory.max", "io.max", "cpuset", "psi"],
+    "namespaces": ["namespace", "userns", "mntns", "pidns", "netns", "containers"],
+}
+
+
+# --- feed generator ---
+
+
+def _subject(rng: random.Random, extra_words: list[str]) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(2, 6))]
+    if extra_words and rng.random() < 0.3:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(extra_words))
+    kind = rng.random()
+    if kind < 0.6:
+        n = rng.randint(1, 12)
+        prefix = f"[PATCH v{rng.randint(1, 5)} {rng.randint(1, n)}/{n}] "
+    elif kind < 0.7:
+        prefix = "[RFC PATCH] "
+    elif kind < 0.8:
+        prefix = "Re: [PATCH] "
+    else:
+        prefix = ""
+    return f"{prefix}{rng.choice(SUBSYSTEMS)}: {' '.join(words)}"
+
+
+def make_feed(
+    list_name: str,
+    entries: int,
+    now: dt.datetime,
+    span_hours: float,
+    seed: int = 0,
+    base: str = "https://lore.kernel.org",
+    extra_words: list[str] | None = None,
+) -> bytes:
+    """A lore-style new.atom document with `entries` entries, newest first,
+    evenly spread over the `span_hours` before `now`."""
+    rng = random.Random(f"{seed}:{list_name}")
+    step = span_hours * 3600 / max(1, entries)
+    parts = [
+        '<?xml version="1.0" encoding="us-ascii"?>\n<feed xmlns="http://www.w3.org/2005/Atom">',
+        f"<title>{list_name}</title><link rel=\"alternate\" href=\"{base}/{list_name}/\"/>",
+        f"<updated>{now.strftime('%Y-%m-%dT%H:%M:%SZ')}</updated>",
+    ]
+    for i in range(entries):
+        ts = (now - dt.timedelta(seconds=i * step)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        mid = f"{ts[:10].replace('-', '')}{i:07d}.{rng.getrandbits(32):08x}-{list_name}@example.org"
+        parts.append(
+            f"<entry><author><name>Dev {rng.randrange(500)}</name><email>dev@example.org</email></author>"
+            f"<title>{escape(_subject(rng, extra_words or []))}</title><updated>{ts}</updated>"
+            f'<link href="{base}/{list_name}/{mid}/"/><id>urn:uuid:{mid}</id>'
+            f'<thr:in-reply-to xmlns:thr="http://purl.org/syndication/thread/1.0" ref="urn:uuid:{mid}"/>'
+            f'<content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><pre>{"x" * 200}</pre></div>'
+            f"</content></entry>"
+        )
+    parts.append("</feed>\n")
+    return "\n".join(parts).encode("ascii")
+
+
+# --- local server ---
+
+
+class FeedServer:
+    """Serves {path: bytes} over HTTP/1.1 keep-alive on 127.0.0.1, sleeping
+    `latency` seconds before each response. Gzip is used when the client
+    accepts it and `compress` is set."""
+
+    def __init__(self, feeds: dict[str, bytes], latency: float = 0.0, compress: bool = False) -> None:
+        self.feeds = feeds
+        self.gz = {p: gzip.compress(b, compresslevel=6) for p, b in feeds.items()} if compress else {}
+        self.requests = 0
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                server.requests += 1
+                if latency:
+                    time.sleep(latency)
+                body = server.feeds.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                gz = "gzip" in self.headers.get("Accept-Encoding", "") and self.path in server.gz
+                if gz:
+                    body = server.gz[self.path]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml")
+                self.send_header("Content-Length", str(len(body)))
+                if gz:
+                    self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt: str, *args) -> None:
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FeedServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# --- scenarios ---
+
+
+def scenario_params(name: str, entries: int) -> dict:
+    if name == "many-lists":
+        return {"lists": 50, "areas": 4, "entries": entries, "since_hours": 24}
+    if name == "many-areas":
+        return {"lists": 4, "areas": 200, "entries": entries, "since_hours": 24}
+    if name == "large-state":
+        return {"lists": 4, "areas": 4, "entries": entries, "since_hours": 24, "seen": True}
+    if name == "long-window":
+        return {"lists": 1, "areas": 4, "entries": entries * 20, "since_hours": 24 * 30}
+    raise ValueError(name)
+
+
+SCENARIOS = ["many-lists", "many-areas", "large-state", "long-window"]
+
+
+def build_areas(count: int) -> dict[str, list[str]]:
+    areas = dict(AREA_KEYWORDS)
+    i = 0
+    while len(areas) < count:
+        areas[f"area{i}"] = [f"kw{i}x{k}" for k in range(9)] + [SUBSYSTEMS[i % len(SUBSYSTEMS)]]
+        i += 1
+    return dict(list(areas.items())[:count])
+
+
+def write_config(workdir: Path, base: str, lists: list[str], areas: dict[str, list[str]]) -> Path:
+    # JSON is valid config input (kernel_radar falls back to it without PyYAML).
+    area_cfg = {}
+    for i, (name, keywords) in enumerate(areas.items()):
+        # Every list is subscribed by at least one area; areas share lists.
+        subscribed = lists if len(lists) <= 4 else lists[i % 4 :: 4]
+        area_cfg[name] = {
+            "keywords": keywords,
+            "lists": [{"name": n, "atom": f"{base}/{n}/new.atom"} for n in subscribed],
+        }
+    cfg = {
+        "state_file": str(workdir / "state" / "state.json"),
+        "areas": area_cfg,
+        "filters": {
+            "include_subject_regex": ["\\[PATCH", "\\[RFC", "regress", "BUG", "fix"],
+            "exclude_subject_regex": [],
+        },
+        "fetch": {"max_workers": 8, "per_host": 8, "timeout_seconds": 60, "budget_seconds": 600},
+        "http_cache": {"enabled": False},
+        "item_cache": {"enabled": False},
+        "index": {"enabled": False},
+        "metrics": {"json": str(workdir / "metrics.json")},
+        "limits": {"max_items_per_area": 40, "max_total_items": 200},
+    }
+    path = workdir / "config.json"
+    path.write_text(json.dumps(cfg, indent=1), encoding="utf-8")
+    return path
+
+
+def prefill_state(workdir: Path, feeds: dict[str, bytes], count: int) -> None:
+    # Half of the feed links (every other entry) plus filler up to `count`.
+    links = []
+    for body in feeds.values():
+        entries, _ = kernel_radar._read_atom_entries(body)
+        links.extend(e[1] for e in entries[::2])
+    links.extend(f"https://lore.kernel.org/old/{i:09d}@example.org/" for i in range(max(0, count - len(links))))
+    store = kernel_radar.SeenStore(workdir / "state" / "state.sqlite")
+    store.add_many(links)
+    store.close()
+
+
+def run_kernel_radar(config: Path, since_hours: int) -> tuple[float, int]:
+    # Returns (wall seconds, peak RSS in bytes) of one kernel_radar run.
+    cmd = [
+        sys.executable, str(REPO / "kernel_radar.py"), "--config", str(config), "--since-hours", str(since_hours),
+        "--out", os.devnull, "--no-http-cache", "--no-item-cache",
+    ]
+    # The compiled-config pickle goes under XDG_CACHE_HOME; keep it in the
+    # scenario's temp dir rather than leaving one per run in ~/.cache.
+    env = dict(os.environ, XDG_CACHE_HOME=str(config.parent / "cache"))
+    t0 = time.monotonic()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, env=env)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.monotonic() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise SystemExit(f"kernel_radar.py failed with exit code {proc.returncode}: {' '.join(cmd)}")
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return wall, rss
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    p = scenario_params(name, args.entries)
+    now = dt.datetime.now(dt.timezone.utc)
+    lists = [f"list{i:02d}" for i in range(p["lists"])]
+    areas = build_areas(p["areas"])
+    extra = [k for kws in areas.values() for k in kws]
+    feeds = {
+        f"/{n}/new.atom": make_feed(n, p["entries"], now, p["since_hours"], seed=args.seed, extra_words=extra)
+        for n in lists
+    }
+    feed_bytes = sum(len(b) for b in feeds.values())
+
+    best: dict | None = None
+    with FeedServer(feeds, latency=args.latency_ms / 1000.0, compress=args.gzip) as server:
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix="bench-kernel-radar-") as tmp:
+                workdir = Path(tmp)
+                config = write_config(workdir, server.base, lists, areas)
+                if p.get("seen"):
+                    prefill_state(workdir, feeds, args.state_links)
+                wall, rss = run_kernel_radar(config, p["since_hours"])
+                metrics = json.loads((workdir / "metrics.json").read_text(encoding="utf-8"))
+            stages = metrics["stages"]
+            entries = metrics["counters"].get("entries", 0)
+            result = {
+                "scenario": name,
+                "lists": p["lists"],
+                "areas": p["areas"],
+                "entries": entries,
+                "feed_mb": round(feed_bytes / 1e6, 2),
+                "wall_seconds": round(wall, 3),
+                "entries_per_second": round(entries / wall) if wall else 0,
+                "parse_seconds": round(sum(f["parse_seconds"] for f in metrics["feeds"].values()), 3),
+                "match_seconds": round(stages.get("match", 0.0), 3),
+                "state_seconds": round(
+                    stages.get("state_load", 0.0) + stages.get("dedupe", 0.0) + stages.get("state_save", 0.0), 3
+                ),
+                "peak_rss_mb": round(rss / 2**20, 1),
+            }
+            if best is None or result["wall_seconds"] < best["wall_seconds"]:
+                best = result
+            else:
+                best["peak_rss_mb"] = max(best["peak_rss_mb"], result["peak_rss_mb"])
+    assert best is not None
+    return best
+
+
+def render_table(results: list[dict]) -> str:
+    cols = [
+        ("scenario", "scenario"), ("lists", "lists"), ("areas", "areas"), ("entries", "entries"),
+        ("feed_mb", "feed MB"), ("wall_seconds", "wall s"), ("entries_per_second", "entries/s"),
+        ("parse_seconds", "parse s"), ("match_seconds", "match s"), ("state_seconds", "state s"),
+        ("peak_rss_mb", "peak RSS MB"),
+    ]
+    rows = [[str(r[k]) for k, _ in cols] for r in results]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, (_, h) in enumerate(cols)]
+    lines = ["  ".join(h.ljust(w) for (_, h), w in zip(cols, widths)).rstrip()]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(row, widths)).rstrip() for row in rows)
+    return "\n".join(lines)
+
+
+def serve(args: argparse.Namespace) -> int:
+    now = dt.datetime.now(dt.timezone.utc)
+    names = [f"list{i:02d}" for i in range(args.lists)]
+    feeds = {f"/{n}/new.atom": make_feed(n, args.entries, now, 24, seed=args.seed) for n in names}
+    with FeedServer(feeds, latency=args.latency_ms / 1000.0, compress=args.gzip) as server:
+        for path in feeds:
+            print(f"{server.base}{path}")
+        print(f"Serving {len(feeds)} feeds of {args.entries} entries; Ctrl-C to stop", file=sys.stderr)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark kernel_radar.py against synthetic local feeds")
+    ap.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run (repeatable; default all)")
+    ap.add_argument("--entries", type=int, default=5000, help="Entries per feed (long-window uses 20x)")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Server delay before each response")
+    ap.add_argument("--gzip", action="store_true", help="Serve gzip-compressed feeds")
+    ap.add_argument("--state-links", type=int, default=200000, help="Seen-state size for large-state")
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the fastest is reported")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="Also write results as JSON to this file")
+    ap.add_argument("--serve", action="store_true", help="Only serve synthetic feeds (see --lists) until Ctrl-C")
+    ap.add_argument("--lists", type=int, default=4, help="Number of feeds for --serve")
+    args = ap.parse_args()
+
+    if args.serve:
+        return serve(args)
+
+    results = []
+    for name in args.scenario or SCENARIOS:
+        print(f"running {name} ...", file=sys.stderr, flush=True)
+        results.append(run_scenario(name, args))
+
+    print(render_table(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the syzbot bug page extractor against saved pages.
+
+Why
+---
+`syzbot_bugpage.parse_bug_page` replaced per-tool extraction that ran the
+page through a separate regex per field and lowercased it once per fix
+keyword. This measures CPU per page for both on the same pages and checks
+that they extract the same fields.
+
+Pages
+-----
+By default real pages are used: the ones committed under
+``tools/testdata/syzbot/`` plus those saved by the bug page cache
+(``~/.cache/kernel_radar/syzbot/*.html.gz``, see tools/syzbot_cache.py), so
+running any syzbot picker once grows the corpus. Files or directories of
+``.html`` / ``.html.gz`` pages can be given instead. With no pages at all,
+synthetic pages shaped like syzbot's are generated; those only show that
+the two extractors agree on markup written for this benchmark, so a
+warning is printed.
+
+``--save EXTID ...`` fetches bug pages from syzbot into
+``tools/testdata/syzbot/<extid>.html`` for committing; pick bugs with
+different shapes (several crashes, no repro, closed as dup, many
+discussions).
+
+Usage
+-----
+  ./tools/bench_syzbot_bugpage.py
+  ./tools/bench_syzbot_bugpage.py saved-pages/ --repeat 20
+  ./tools/bench_syzbot_bugpage.py --synthetic 200 --json bench.json
+  ./tools/bench_syzbot_bugpage.py --save f8850bc3986562f79619
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import time
+from html import unescape
+from pathlib import Path
+
+from radar_http import get_text
+from syzbot_bugpage import BASE, FIX_SIGNALS, BugPage, html_unescape_amp, parse_bug_page
+from syzbot_cache import default_cache_dir
+
+TESTDATA_DIR = Path(__file__).resolve().parent / "testdata" / "syzbot"
+UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
+
+
+def legacy_extract(html: str) -> BugPage:
+    # The per-field scans the tools ran before syzbot_bugpage (the union of
+    # syzbot_pick_unclaimed.py, syzbot_check_in_progress.py and
+    # syzbot_prepare_qemu_repro.py).
+    m = re.search(r"<b>(.*?)</b><br>", html, re.I | re.S)
+    title = unescape(m.group(1)).strip() if m else None
+
+    m = re.search(r"Status:\s*<a[^>]*href=\"([^\"]+)\"[^>]*>([^<]+)</a>", html, re.I)
+    status = unescape(m.group(2)).strip() if m else None
+    status_link = unescape(m.group(1)) if m else None
+
+    subsystems: list[str] = []
+    m = re.search(r"Subsystems:\s*(.*?)<br", html, re.I | re.S)
+    if m:
+        subsystems = [s.strip() for s in re.findall(r"/upstream/s/[^\"]+\">([^<]+)</a>", m.group(1)) if s.strip()]
+
+    text_links = [html_unescape_amp(x) for x in re.findall(r"(/text\?tag=[^\"\s<>]+)", html)]
+    asset_links = re.findall(r"https?://storage\.googleapis\.com/syzbot-assets/[^\"\s<>]+", html)
+    hrefs = [unescape(x) for x in re.findall(r"href=\"([^\"]+)\"", html)]
+    lore_links = [h for h in hrefs if "lore.kernel.org" in h]
+
+    fix_signals = []
+    for kw in FIX_SIGNALS:
+        if kw.lower() in html.lower():
+            fix_signals.append(kw)
+
+    return BugPage(
+        title=title,
+        status=status,
+        status_link=status_link,
+        subsystems=subsystems,
+        text_links=text_links,
+        asset_links=asset_links,
+        lore_links=lore_links,
+        fix_signals=fix_signals,
+    )
+
+
+def synthetic_page(rng: random.Random, i: int) -> str:
+    extid = "%020x" % rng.getrandbits(80)
+    subsystems = rng.sample(["net", "mm", "fs", "bpf", "kvm", "block", "usb", "rcu"], rng.randint(1, 3))
+    status = rng.choice(
+        ["upstream: reported C repro on 2026/01/13 18:06", "upstream: reported syz repro on 2025/12/01 09:00"]
+    )
+    parts = [
+        "<!doctype html><html><head><title>syzbot</title>",
+        "<style>" + "td { padding: 2px; }\n" * 200 + "</style></head><body>",
+        f"<b>KASAN: slab-use-after-free Read in func_{i}</b><br>",
+        f'Status: <a href="https://groups.google.com/d/msgid/syzkaller-bugs/{extid}%40google.com">{status}</a><br>',
+        "Subsystems: "
+        + " ".join(f'<span class="bug-label"><a href="/upstream/s/{s}">{s}</a></span>' for s in subsystems)
+        + "<br>",
+        f"Reported-by: syzbot+{extid}@syzkaller.appspotmail.com<br>",
+        "<table class=\"list_table\"><caption>Discussions</caption>",
+    ]
+    for t in range(rng.randint(1, 6)):
+        subject = rng.choice(["[syzbot] [net?] KASAN", "[PATCH] net: fix uaf", "Re: [syzbot] KASAN"])
+        parts.append(
+            f'<tr><td><a href="https://lore.kernel.org/all/{extid}.{t}@google.com/T/">{subject}</a></td>'
+            f"<td>{rng.randint(0, 9)}</td></tr>"
+        )
+    parts.append("</table><table class=\"list_table\"><caption>Crashes</caption>")
+    for c in range(rng.randint(5, 40)):
+        x = "%016x" % rng.getrandbits(64)
+        parts.append(
+            "<tr>"
+            f'<td class="time">2026/01/{1 + c % 28:02d} 10:00</td>'
+            f'<td><a href="/text?tag=KernelConfig&amp;x={x}">.config</a></td>'
+            f'<td><a href="/text?tag=CrashLog&amp;x={x}">log</a></td>'
+            f'<td><a href="/text?tag=CrashReport&amp;x={x}">report</a></td>'
+            + (f'<td><a href="/text?tag=ReproC&amp;x={x}">C</a></td>' if c == 0 else "<td></td>")
+            + (f'<td><a href="/text?tag=ReproSyz&amp;x={x}">syz</a></td>' if c < 2 else "<td></td>")
+            + f'<td><a href="https://storage.googleapis.com/syzbot-assets/{x}/disk-{x[:8]}.raw.xz">disk</a>'
+            f' <a href="https://storage.googleapis.com/syzbot-assets/{x}/bzImage-{x[:8]}.xz">bzImage</a></td>'
+            "</tr>"
+        )
+    parts.append("</table></body></html>")
+    return "\n".join(parts)
+
+
+def load_pages(paths: list[str]) -> list[tuple[str, str]]:
+    files: list[Path] = []
+    for p in [Path(x).expanduser() for x in paths] or [TESTDATA_DIR, default_cache_dir()]:
+        if p.is_dir():
+            files.extend(sorted(f for f in p.iterdir() if f.name.endswith((".html", ".html.gz"))))
+        elif p.is_file():
+            files.append(p)
+    pages = []
+    for f in files:
+        data = f.read_bytes()
+        if f.name.endswith(".gz"):
+            data = gzip.decompress(data)
+        pages.append((f.name, data.decode("utf-8", "replace")))
+    return pages
+
+
+def save_pages(extids: list[str], timeout: int) -> int:
+    TESTDATA_DIR.mkdir(parents=True, exist_ok=True)
+    for extid in extids:
+        try:
+            html = get_text(f"{BASE}/bug?extid={extid}", timeout=timeout, headers=UA)
+        except Exception as e:
+            print(f"ERROR: {extid}: {e}", file=sys.stderr)
+            return 1
+        path = TESTDATA_DIR / f"{extid}.html"
+        path.write_text(html, encoding="utf-8")
+        print(f"saved {path} ({len(html) // 1024} KiB)")
+    return 0
+
+
+def time_per_page(fn, pages: list[str], repeat: int) -> float:
+    # Fastest of `repeat` passes over all pages, in microseconds per page.
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(pages) * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark syzbot bug page extraction on saved pages")
+    ap.add_argument("pages", nargs="*", help=f"Page files or directories (default: {default_cache_dir()})")
+    ap.add_argument("--synthetic", type=int, default=0, help="Use N synthetic pages instead of saved ones")
+    ap.add_argument("--repeat", type=int, default=10, help="Passes over the pages; the fastest is reported")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="Also write results as JSON to this file")
+    ap.add_argument("--save", nargs="+", metavar="EXTID", help="Fetch these bug pages into tools/testdata/syzbot and exit")
+    ap.add_argument("--timeout", type=int, default=30, help="Fetch timeout for --save")
+    args = ap.parse_args()
+
+    if args.save:
+        return save_pages(args.save, args.timeout)
+
+    pages = [] if args.synthetic else load_pages(args.pages)
+    source = "saved"
+    if not pages:
+        rng = random.Random(args.seed)
+        pages = [(f"synthetic-{i}", synthetic_page(rng, i)) for i in range(args.synthetic or 100)]
+        source = "synthetic"
+        print("WARN: no saved bug pages; comparing on synthetic pages only", file=sys.stderr)
+
+    mismatches = []
+    for name, html in pages:
+        old, new = legacy_extract(html), parse_bug_page(html)
+        diff = [f for f in BugPage.__dataclass_fields__ if getattr(old, f) != getattr(new, f)]
+        if diff:
+            mismatches.append({"page": name, "fields": diff})
+
+    htmls = [html for _, html in pages]
+    legacy_us = time_per_page(legacy_extract, htmls, args.repeat)
+    single_us = time_per_page(parse_bug_page, htmls, args.repeat)
+    result = {
+        "pages": len(pages),
+        "source": source,
+        "avg_kb": round(sum(len(h) for h in htmls) / len(htmls) / 1024, 1),
+        "legacy_us_per_page": round(legacy_us, 1),
+        "single_pass_us_per_page": round(single_us, 1),
+        "speedup": round(legacy_us / single_us, 2) if single_us else None,
+        "mismatches": mismatches,
+    }
+
+    print(f"{result['pages']} {source} pages, {result['avg_kb']} KiB average")
+    print(f"legacy per-field regexes: {result['legacy_us_per_page']:>9} us/page")
+    print(f"single-pass extractor:    {result['single_pass_us_per_page']:>9} us/page ({result['speedup']}x)")
+    for mm in mismatches[:20]:
+        print(f"MISMATCH {mm['page']}: {', '.join(mm['fields'])}", file=sys.stderr)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
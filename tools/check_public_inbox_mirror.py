@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Check kernel_radar's public-inbox mirror reader against a tiny local inbox.
+
+Why
+---
+`PublicInboxMirror` parses `git log --raw` and `git cat-file --batch` output
+of a public-inbox repository and keeps per-epoch heads between runs. None of
+that needs lore or a real grokmirror clone to exercise, so this script builds
+a throwaway v2 inbox with git plumbing and checks what `read()` returns.
+
+The inbox
+---------
+  git/0.git  m: a message from 2024, before the read window
+             m: a patch touching net/core/dev.c (diffstat and diff)
+             m: a reply to it (In-Reply-To, folded Subject)
+             m: spam
+             d: its deletion (public-inbox v2 replaces m with d)
+             m: added between the two incremental reads
+  git/1.git  m: a message whose Message-ID needs quoting in the link
+
+Checks
+------
+- every epoch is read, oldest commit first; a "d" commit yields no entry
+  (a message already read is not taken back)
+- links, reply parents, bodies, and patch paths (only when asked for)
+- --since cuts commits older than the window
+- a second read with the returned heads only returns commits added since
+- a head that is no longer in the history (rewritten epoch) falls back to
+  reading the window
+
+Exits 1 if any check fails.
+
+Usage
+-----
+  ./tools/check_public_inbox_mirror.py
+  ./tools/check_public_inbox_mirror.py --keep /tmp/inbox   # keep the inbox for a look
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from kernel_radar import PublicInboxMirror  # noqa: E402
+
+LINK_BASE = "https://lore.kernel.org/netdev/"
+NOW = dt.datetime(2026, 10, 1, 12, 0, tzinfo=dt.timezone.utc)
+
+PATCH = """\
+From: Alice Dev <alice@example.org>
+Subject: [PATCH net] net: core: fix refcount leak
+Message-ID: <20261001100000.1-1-alice@example.org>
+Date: Thu, 01 Oct 2026 10:00:00 +0000
+
+Drop the reference on the error path.
+
+Signed-off-by: Alice Dev <alice@example.org>
+---
+ net/core/dev.c | 1 +
+ 1 file changed, 1 insertion(+)
+
+diff --git a/net/core/dev.c b/net/core/dev.c
+--- a/net/core/dev.c
++++ b/net/core/dev.c
+@@ -1 +1,2 @@
+ a
++b
+"""
+
+REPLY = """\
+From: Bob Reviewer <bob@example.org>
+Subject: Re: [PATCH net] net: core: fix
+ refcount leak
+Message-ID: <reply-1@example.org>
+In-Reply-To: <20261001100000.1-1-alice@example.org>
+Date: Thu, 01 Oct 2026 10:30:00 +0000
+
+Reviewed-by: Bob Reviewer <bob@example.org>
+"""
+
+SPAM = """\
+From: spam@example.com
+Subject: buy now
+Message-ID: <spam@example.com>
+Date: Thu, 01 Oct 2026 10:40:00 +0000
+
+spam
+"""
+
+OLD = """\
+From: Carol <carol@example.org>
+Subject: [RFC] an old thread
+Message-ID: <old@example.org>
+Date: Mon, 01 Jan 2024 00:00:00 +0000
+
+old
+"""
+
+QUOTED = """\
+From: Dave <dave@example.org>
+Subject: [PATCH] mm: odd message id
+Message-ID: <a/b%c@example.org>
+Date: Thu, 01 Oct 2026 11:00:00 +0000
+
+no diff here
+"""
+
+LATE = """\
+From: Alice Dev <alice@example.org>
+Subject: [PATCH net v2] net: core: fix refcount leak
+Message-ID: <20261001113000.1-1-alice@example.org>
+Date: Thu, 01 Oct 2026 11:30:00 +0000
+
+v2
+"""
+
+
+class Epoch:
+    """One bare epoch repository, committed to the way public-inbox v2 does."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.head = ""
+        self.git("init", "-q", "--bare", str(path), git_dir=False)
+
+    def git(self, *args: str, stdin: str | None = None, when: dt.datetime | None = None, git_dir: bool = True) -> str:
+        env = dict(os.environ, GIT_AUTHOR_NAME="x", GIT_AUTHOR_EMAIL="x@example.org")
+        env.update(GIT_COMMITTER_NAME="x", GIT_COMMITTER_EMAIL="x@example.org")
+        if when is not None:
+            env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{int(when.timestamp())} +0000"
+        cmd = ["git", f"--git-dir={self.path}", *args] if git_dir else ["git", *args]
+        return subprocess.run(cmd, input=stdin, env=env, capture_output=True, text=True, check=True).stdout.strip()
+
+    def commit(self, name: str, raw: str, when: dt.datetime) -> str:
+        # Every commit's tree holds exactly one file: "m" (a message) or "d"
+        # (a deleted message).
+        blob = self.git("hash-object", "-w", "--stdin", stdin=raw)
+        tree = self.git("mktree", stdin=f"100644 blob {blob}\t{name}\n")
+        parent = ["-p", self.head] if self.head else []
+        self.head = self.git("commit-tree", tree, *parent, "-m", name, when=when)
+        self.git("update-ref", "refs/heads/master", self.head)
+        return self.head
+
+
+def build_inbox(root: Path) -> tuple[Epoch, Epoch]:
+    e0 = Epoch(root / "git" / "0.git")
+    e0.commit("m", OLD, dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc))
+    e0.commit("m", PATCH, NOW - dt.timedelta(hours=2))
+    e0.commit("m", REPLY, NOW - dt.timedelta(hours=1, minutes=30))
+    e0.commit("m", SPAM, NOW - dt.timedelta(hours=1, minutes=20))
+    e0.commit("d", SPAM, NOW - dt.timedelta(hours=1, minutes=10))
+    e1 = Epoch(root / "git" / "1.git")
+    e1.commit("m", QUOTED, NOW - dt.timedelta(hours=1))
+    return e0, e1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Check PublicInboxMirror.read() on a tiny local v2 inbox")
+    ap.add_argument("--keep", help="Build the inbox in this (new) directory and keep it")
+    args = ap.parse_args()
+
+    failures: list[str] = []
+
+    def check(what: str, got: object, want: object) -> None:
+        if got != want:
+            failures.append(what)
+            print(f"FAIL {what}: got {got!r}, want {want!r}", file=sys.stderr)
+        else:
+            print(f"ok   {what}")
+
+    with tempfile.TemporaryDirectory(prefix="radar-inbox-") as tmp:
+        root = Path(args.keep) if args.keep else Path(tmp)
+        e0, e1 = build_inbox(root)
+        mirror = PublicInboxMirror(root, LINK_BASE.rstrip("/"))
+        patch_link = LINK_BASE + "20261001100000.1-1-alice@example.org/"
+        quoted_link = LINK_BASE + "a%2Fb%25c@example.org/"
+
+        check("epochs", mirror.epochs(), [e0.path, e1.path])
+
+        since = NOW - dt.timedelta(days=1)
+        bodies: dict[str, str] = {}
+        entries, heads = mirror.read({}, since=since, bodies=bodies, collect_paths=True)
+        by_link = {e[1]: e for e in entries}
+        check(
+            "first read: windowed messages in commit order, deletion skipped",
+            [e[1] for e in entries],
+            [patch_link, LINK_BASE + "reply-1@example.org/", LINK_BASE + "spam@example.com/", quoted_link],
+        )
+        check("heads", heads, {str(e0.path): e0.head, str(e1.path): e1.head})
+        patch = by_link.get(patch_link, ("",) * 6)
+        check("subject", patch[0], "[PATCH net] net: core: fix refcount leak")
+        check("author", patch[2], "Alice Dev")
+        check("published", patch[3], "2026-10-01T10:00:00+00:00")
+        check("patch paths", patch[5], ("net/core/dev.c",))
+        check("body recorded", "Drop the reference" in bodies.get(patch_link, ""), True)
+        reply = by_link.get(LINK_BASE + "reply-1@example.org/", ("",) * 6)
+        check("folded subject", reply[0], "Re: [PATCH net] net: core: fix refcount leak")
+        check("reply parent", reply[4], patch_link)
+        check("no paths without a diff", by_link.get(quoted_link, ("",) * 6)[5], ())
+
+        entries, _ = mirror.read({}, bodies={})
+        check("no paths unless asked for", {e[5] for e in entries}, {()})
+        check("no window: old commits are read too", LINK_BASE + "old@example.org/" in {e[1] for e in entries}, True)
+
+        check("nothing new", mirror.read(heads, since=since)[0], [])
+        e0.commit("m", LATE, NOW - dt.timedelta(minutes=30))
+        entries, heads2 = mirror.read(heads, since=since)
+        check("incremental read", [e[1] for e in entries], [LINK_BASE + "20261001113000.1-1-alice@example.org/"])
+        check("incremental heads", heads2, {str(e0.path): e0.head, str(e1.path): e1.head})
+
+        stale = dict(heads2, **{str(e1.path): "0" * 40})
+        entries, heads3 = mirror.read(stale, since=since)
+        check("rewritten epoch falls back to the window", [e[1] for e in entries], [quoted_link])
+        check("rewritten epoch head", heads3[str(e1.path)], e1.head)
+
+    print(f"{'FAILED' if failures else 'passed'}: {len(failures)} of the checks failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
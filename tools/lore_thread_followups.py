@@ -33,16 +33,15 @@ import email
 import gzip
 import re
 import urllib.parse
-import urllib.request
 from email import policy
 
+from radar_http import get_bytes
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
 def http_get_bytes(url: str, timeout: int) -> bytes:
-    req = urllib.request.Request(url, headers=UA)
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read()
+    return get_bytes(url, timeout=timeout, headers=UA)
 
 
 def normalize_mid(mid: str) -> str:
@@ -0,0 +1,418 @@
+"""Shared HTTP client for kernel_radar.py and the tools/ scripts.
+
+Not a standalone tool; imported by the scripts in this directory
+(and by kernel_radar.py, which adds tools/ to sys.path).
+
+Connection reuse
+----------------
+urllib.request.urlopen opens (and TLS-handshakes) a new connection for every
+request. `HttpClient` keeps idle keep-alive connections per host and hands
+them out to one request at a time, so a scan of hundreds of syzbot bug pages
+pays for one handshake instead of one per page. It is thread-safe; a
+process-wide instance is available via `get_client()`.
+
+- redirects (301/302/303/307/308) are followed, up to 5
+- non-2xx/3xx responses raise urllib.error.HTTPError, like urlopen
+- GETs are retried on connection errors, timeouts and 429/5xx with
+  exponential backoff (Retry-After is honoured, capped); a pooled connection
+  the server already closed is replaced without counting as a retry
+- http(s)_proxy / no_proxy from the environment are honoured, including
+  user:password@ credentials (sent as Proxy-Authorization: Basic)
+
+Compressed transfer
+-------------------
+Requests advertise ``Accept-Encoding: gzip, deflate`` (plus ``br`` when the
+optional ``brotli`` module is installed) and responses are decompressed
+while they are read, so callers that stream a body (e.g. the Atom parser)
+never hold the compressed and decompressed copies at once.
+
+Usage
+-----
+  from radar_http import get_text, get_client, decoded_chunks
+
+  html = get_text("https://syzkaller.appspot.com/upstream", timeout=30)
+
+  with get_client().open(url, headers={"If-None-Match": etag}, timeout=20) as r:
+      if r.status == 304: ...
+      for chunk in decoded_chunks(r): ...
+"""
+
+from __future__ import annotations
+
+import base64
+import email.utils
+import http.client
+import io
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from typing import Iterator, Protocol
+
+try:
+    import brotli  # type: ignore
+except ModuleNotFoundError:  # optional
+    brotli = None
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Decoder(Protocol):
+    def decompress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _DeflateDecoder:
+    # "deflate" is meant to be zlib-wrapped, but some servers send raw
+    # deflate; decide on the first chunk.
+    def __init__(self) -> None:
+        self._obj = None
+        self._buf = b""
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._obj is None:
+            self._buf += data
+            if len(self._buf) < 2:
+                return b""
+            data, self._buf = self._buf, b""
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        if self._obj is None:
+            return zlib.decompress(self._buf) if self._buf else b""
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self) -> None:
+        self._obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        # brotli exposes process(); brotlicffi exposes decompress()
+        fn = getattr(self._obj, "process", None) or self._obj.decompress
+        return fn(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decoder(content_encoding: str | None) -> _Decoder | None:
+    enc = (content_encoding or "").strip().lower()
+    if enc in ("", "identity"):
+        return None
+    if enc in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if enc == "deflate":
+        return _DeflateDecoder()
+    if enc == "br" and brotli is not None:
+        return _BrotliDecoder()
+    raise ValueError(f"unsupported Content-Encoding: {content_encoding}")
+
+
+def decoded_chunks(resp, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the response body in chunks, decompressing per Content-Encoding."""
+    dec = _decoder(resp.headers.get("Content-Encoding"))
+    while True:
+        chunk = resp.read(chunk_size)
+        if not chunk:
+            break
+        out = dec.decompress(chunk) if dec is not None else chunk
+        if out:
+            yield out
+    if dec is not None:
+        tail = dec.flush()
+        if tail:
+            yield tail
+
+
+def read_body(resp) -> bytes:
+    """Read and decompress the whole response body."""
+    return b"".join(decoded_chunks(resp))
+
+
+USER_AGENT = "kernel_radar/0.1 (+local)"
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Errors that mean a reused keep-alive connection was already closed by the
+# server; the request is resent on a fresh connection.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+def _proxy_auth(proxy: str) -> str | None:
+    # Basic Proxy-Authorization for a proxy URL with user:password@, as
+    # urllib's ProxyHandler sends it.
+    p = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+    if p.username is None:
+        return None
+    user = urllib.parse.unquote(p.username)
+    password = urllib.parse.unquote(p.password or "")
+    return "Basic " + base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+
+
+class Response:
+    """A response on a pooled connection.
+
+    Read it fully (or use it as a context manager) so the connection can go
+    back to the pool; closing it early discards the connection instead.
+    """
+
+    def __init__(self, client: "HttpClient", key: tuple, conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse, url: str) -> None:
+        self._client = client
+        self._key = key
+        self._conn: http.client.HTTPConnection | None = conn
+        self._resp = resp
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.msg
+        self.bytes_read = 0  # body bytes as transferred (before Content-Encoding)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def read(self, n: int = -1) -> bytes:
+        data = self._resp.read() if n is None or n < 0 else self._resp.read(n)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if not self._resp.isclosed() and self._resp.length == 0:
+            # e.g. 304 / empty body: nothing left to read, keep the connection
+            self._resp.read()
+        if self._resp.isclosed():
+            self._client._release(self._key, conn)
+        else:
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HttpClient:
+    """Thread-safe HTTP/1.1 client with per-host keep-alive connection pools."""
+
+    def __init__(
+        self,
+        max_idle_per_host: int = 8,
+        idle_timeout: float = 60.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_retry_after: float = 30.0,
+    ) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self._idle: dict[tuple, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._ssl = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+
+    # -- pool ---------------------------------------------------------------
+
+    def _target(self, url: str) -> tuple[tuple, str]:
+        # Returns (pool key, request target).
+        u = urllib.parse.urlsplit(url)
+        if u.scheme not in ("http", "https") or not u.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = u.port or (443 if u.scheme == "https" else 80)
+        path = urllib.parse.urlunsplit(("", "", u.path or "/", u.query, ""))
+        proxy = self._proxies.get(u.scheme)
+        if proxy and urllib.request.proxy_bypass(u.hostname):
+            proxy = None
+        if proxy and u.scheme == "http":
+            # Plain HTTP through a proxy uses the absolute URL as target.
+            path = urllib.parse.urlunsplit((u.scheme, u.netloc, u.path or "/", u.query, ""))
+        return (u.scheme, u.hostname, port, proxy), path
+
+    def _connect(self, key: tuple, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        if proxy:
+            p = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+            phost, pport = p.hostname or "", p.port or 8080
+            if scheme == "https":
+                conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                    phost, pport, timeout=timeout, context=self._ssl
+                )
+                auth = _proxy_auth(proxy)
+                conn.set_tunnel(host, port, headers={"Proxy-Authorization": auth} if auth else None)
+                return conn
+            return http.client.HTTPConnection(phost, pport, timeout=timeout)
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(self, key: tuple, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        # Returns (connection, reused).
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                last_used, conn = idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(key, timeout), False
+
+    def _release(self, key: tuple, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for _, conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+    # -- requests -----------------------------------------------------------
+
+    def _send_once(self, url: str, headers: dict[str, str], timeout: float) -> Response:
+        key, target = self._target(url)
+        scheme, _, _, proxy = key
+        auth = _proxy_auth(proxy) if proxy and scheme == "http" else None
+        if auth:
+            # Plain HTTP goes to the proxy directly; HTTPS sends it on CONNECT.
+            headers = {**headers, "Proxy-Authorization": auth}
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            return Response(self, key, conn, resp, url)
+
+    def _retry_delay(self, attempt: int, resp: Response | None) -> float:
+        delay = self.backoff * (2 ** attempt)
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass  # malformed; keep the backoff delay
+        return min(self.max_retry_after, max(0.0, delay))
+
+    def open(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = 30,
+        retries: int | None = None,
+    ) -> Response:
+        """GET `url`; returns a streaming Response (2xx or 304).
+
+        Defaults: User-Agent and Accept-Encoding (bodies are *not* decoded
+        here; use read_body()/decoded_chunks()). Pass
+        {"Accept-Encoding": "identity"} for byte-range downloads.
+        """
+        hdrs = {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING}
+        hdrs.update(headers or {})
+        retries = self.retries if retries is None else retries
+
+        redirects = 0
+        attempt = 0
+        while True:
+            try:
+                resp = self._send_once(url, hdrs, timeout)
+            except (OSError, http.client.HTTPException) as e:
+                if attempt >= retries:
+                    if isinstance(e, OSError):
+                        raise urllib.error.URLError(e) from e
+                    raise
+                time.sleep(self._retry_delay(attempt, None))
+                attempt += 1
+                continue
+
+            if resp.status in _REDIRECTS and resp.headers.get("Location") and redirects < 5:
+                location = urllib.parse.urljoin(url, resp.headers["Location"])
+                resp.read()
+                resp.close()
+                url = location
+                redirects += 1
+                continue
+
+            if resp.status in _RETRY_STATUSES and attempt < retries:
+                delay = self._retry_delay(attempt, resp)
+                resp.read()
+                resp.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if resp.status >= 400:
+                hdr = resp.headers
+                try:
+                    body = read_body(resp)
+                except (OSError, http.client.HTTPException, ValueError, zlib.error):
+                    body = b""
+                resp.close()
+                # Like urlopen's, the error carries the (decoded) body for e.read().
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, hdr, io.BytesIO(body))
+            return resp
+
+    def get_bytes(self, url: str, timeout: float = 30, headers: dict[str, str] | None = None) -> bytes:
+        """GET `url` and return the decompressed body."""
+        with self.open(url, headers=headers, timeout=timeout) as r:
+            return read_body(r)
+
+    def get_text(self, url: str, timeout: float = 30, headers: dict[str, str] | None = None) -> str:
+        return self.get_bytes(url, timeout=timeout, headers=headers).decode("utf-8", "replace")
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """The process-wide shared client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get_bytes(url: str, timeout: float = 30, headers: dict[str, str] | None = None) -> bytes:
+    return get_client().get_bytes(url, timeout=timeout, headers=headers)
+
+
+def get_text(url: str, timeout: float = 30, headers: dict[str, str] | None = None) -> str:
+    return get_client().get_text(url, timeout=timeout, headers=headers)
@@ -35,13 +35,14 @@ import argparse
 import os
 import subprocess
 import urllib.parse
-import urllib.request
 from pathlib import Path
 from email.utils import getaddresses, formataddr
 from email.message import EmailMessage
 from email import policy
 import email
 
+from radar_http import get_text
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
@@ -55,8 +56,7 @@ def lore_raw_url(list_name: str, mid: str) -> str:
 
 def fetch_lore_message(list_name: str, mid: str, timeout: int) -> email.message.EmailMessage:
     url = lore_raw_url(list_name, mid)
-    req = urllib.request.Request(url, headers=UA)
-    raw = urllib.request.urlopen(req, timeout=timeout).read().decode("utf-8", "replace")
+    raw = get_text(url, timeout=timeout, headers=UA)
     lines = raw.splitlines()
     if lines and lines[0].startswith("From "):
         raw = "\n".join(lines[1:])
@@ -23,14 +23,14 @@ Usage examples:
 from __future__ import annotations
 
 import argparse
-import re
 import sys
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
-from html import unescape
 
-BASE = "https://syzkaller.appspot.com"
+from radar_http import get_text
+from syzbot_bugpage import BASE, parse_bug_page
+from syzbot_cache import BugPageCache, add_cache_args, cache_from_args
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
@@ -50,59 +50,29 @@ class BugSummary:
 
 
 def http_get_text(url: str, timeout: int) -> str:
-    req = urllib.request.Request(url, headers=UA)
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read().decode("utf-8", "replace")
-
-
-def html_unescape_amp(s: str) -> str:
-    return s.replace("&amp;", "&")
+    return get_text(url, timeout=timeout, headers=UA)
 
 
-def scrape_bug(extid: str, timeout: int) -> BugSummary:
+def scrape_bug(extid: str, timeout: int, cache: BugPageCache | None = None) -> BugSummary:
     bug_url = f"{BASE}/bug?extid={urllib.parse.quote(extid)}"
-    html = http_get_text(bug_url, timeout=timeout)
-
-    m = re.search(r"<b>(.*?)</b><br>", html, re.I | re.S)
-    title = unescape(m.group(1)).strip() if m else None
-
-    m = re.search(r"Status:\s*<a[^>]*href=\"([^\"]+)\"[^>]*>([^<]+)</a>", html, re.I)
-    status_thread = unescape(m.group(1)) if m else None
-    status = unescape(m.group(2)).strip() if m else None
-
-    subsystems: list[str] = []
-    m = re.search(r"Subsystems:\s*(.*?)<br", html, re.I | re.S)
-    if m:
-        block = m.group(1)
-        subsystems = [
-            s.strip()
-            for s in re.findall(r"/upstream/s/[^\"]+\">([^<]+)</a>", block)
-            if s.strip()
-        ]
-
-    text_links = [html_unescape_amp(x) for x in re.findall(r"(/text\?tag=[^\"\s<>]+)", html)]
-
-    def pick(tag: str) -> str | None:
-        for lnk in text_links:
-            if f"tag={tag}" in lnk:
-                return BASE + lnk
-        return None
-
-    hrefs = [unescape(x) for x in re.findall(r'href="([^"]+)"', html)]
-    lore_threads = [h for h in hrefs if "lore.kernel.org" in h and re.search(r"/T/\s*$", h)]
+    if cache is None:
+        html = http_get_text(bug_url, timeout=timeout)
+    else:
+        html = cache.page(bug_url, lambda url: http_get_text(url, timeout=timeout))
 
+    page = parse_bug_page(html)
     return BugSummary(
         extid=extid,
         bug_url=bug_url,
-        title=title,
-        status=status,
-        status_thread=status_thread,
-        subsystems=subsystems,
-        kernel_config=pick("KernelConfig"),
-        repro_c=pick("ReproC"),
-        repro_syz=pick("ReproSyz"),
-        crash_report=pick("CrashReport"),
-        lore_threads=lore_threads,
+        title=page.title,
+        status=page.status,
+        status_thread=page.status_link,
+        subsystems=page.subsystems,
+        kernel_config=page.text_link("KernelConfig"),
+        repro_c=page.text_link("ReproC"),
+        repro_syz=page.text_link("ReproSyz"),
+        crash_report=page.text_link("CrashReport"),
+        lore_threads=page.lore_threads,
     )
 
 
@@ -174,7 +144,9 @@ def main(argv: list[str]) -> int:
     ap.add_argument("--file", help="read extids from file (one per line; # comments ok)")
     ap.add_argument("--timeout", type=int, default=30)
     ap.add_argument("--markdown", action="store_true", help="print in Markdown format")
+    add_cache_args(ap)
     args = ap.parse_args(argv)
+    cache = cache_from_args(args)
 
     extids: list[str] = []
     if args.file:
@@ -188,7 +160,7 @@ def main(argv: list[str]) -> int:
     for i, extid in enumerate(extids):
         if i:
             print("\n---\n") if args.markdown else print("---")
-        b = scrape_bug(extid, timeout=args.timeout)
+        b = scrape_bug(extid, timeout=args.timeout, cache=cache)
         if args.markdown:
             print_markdown(b)
         else:
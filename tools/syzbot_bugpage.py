@@ -0,0 +1,164 @@
+"""Shared single-pass extractor for syzbot bug pages.
+
+Not a standalone tool; imported by syzbot_pick_top3.py,
+syzbot_pick_unclaimed.py, syzbot_bug_summary.py, syzbot_check_in_progress.py,
+syzbot_prepare_qemu_repro.py and the bug page cache validator in
+syzbot_cache.py.
+
+What it extracts
+----------------
+From a ``bug?extid=...`` page, into a `BugPage`:
+- title: the first ``<b>...</b><br>``
+- status text and status link: ``Status: <a href="...">...</a>``
+- subsystems: the ``/upstream/s/...`` labels after ``Subsystems:``
+- attachment links: ``/text?tag=ReproC&x=...`` (KernelConfig, ReproSyz, ...)
+- syzbot asset links on storage.googleapis.com (disk/bzImage/vmlinux)
+- every lore.kernel.org href, in page order
+- fix-ish keywords anywhere on the page (FIX_SIGNALS)
+
+How
+---
+One combined regex walks the page once; each alternative is a token the
+tools used to look for with a separate search. The tokenizer is
+case-sensitive, matching how syzbot renders the page: with re.I (or even a
+"[Ss]" class) sre loses its first-character prefilter and gets several times
+slower than the separate searches. The fix keywords are looked up in a
+single lowercased copy of the page rather than one copy per keyword.
+Results match the per-field regexes the tools used before; see
+tools/bench_syzbot_bugpage.py, which times and compares the two on saved
+pages.
+
+Usage
+-----
+  from syzbot_bugpage import parse_bug_page
+
+  page = parse_bug_page(html)
+  page.title, page.status, page.text_link("ReproC"), page.lore_threads
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import unescape
+
+BASE = "https://syzkaller.appspot.com"
+
+# Keywords that suggest a bug is fixed or a duplicate, reported with this
+# spelling. Avoid overly-broad keywords like "Patched", which can appear in
+# label docs.
+FIX_SIGNALS = ["upstream: fixed", "fixed:", "Fix commit", "Fixing commit", "Resolved", "dup"]
+
+_TOKEN_RE = re.compile(
+    r"<b>(?P<bold>[^<]*)</b><br>"
+    r"|Status:\s*<a(?P<status_attrs>[^>]*)>(?P<status>[^<]+)</a>"
+    r"|Subsystems:(?P<subsystems>.*?)<br"
+    r'|href="(?P<href>[^"]+)"'
+    # Bare links get no group: a group opening a branch also disables sre's
+    # first-character prefilter. They are told apart by their first char.
+    r"|/text\?tag=[^\"\s<>]+"
+    r"|https?://storage\.googleapis\.com/syzbot-assets/[^\"\s<>]+",
+    re.S,
+)
+_HREF_RE = re.compile(r'href="([^"]+)"')
+_SUBSYSTEM_RE = re.compile(r"/upstream/s/[^\"]+\">([^<]+)</a>")
+_TEXT_RE = re.compile(r"/text\?tag=[^\"\s<>]+")
+_ASSET_RE = re.compile(r"https?://storage\.googleapis\.com/syzbot-assets/[^\"\s<>]+")
+_LORE_THREAD_RE = re.compile(r"/T/\s*$")
+
+
+def html_unescape_amp(s: str) -> str:
+    # syzkaller HTML uses &amp; in hrefs; attachment links only need that.
+    return s.replace("&amp;", "&")
+
+
+@dataclass(frozen=True)
+class BugPage:
+    title: str | None = None
+    status: str | None = None
+    status_link: str | None = None
+    subsystems: list[str] = field(default_factory=list)
+    text_links: list[str] = field(default_factory=list)  # "/text?tag=...", &amp; unescaped
+    asset_links: list[str] = field(default_factory=list)
+    lore_links: list[str] = field(default_factory=list)  # unescaped, page order, repeats kept
+    fix_signals: list[str] = field(default_factory=list)  # in FIX_SIGNALS order
+
+    def text_link(self, tag: str) -> str | None:
+        """Absolute URL of the first attachment link with this tag (e.g. "ReproC")."""
+        for lnk in self.text_links:
+            if f"tag={tag}" in lnk:
+                return BASE + lnk
+        return None
+
+    def asset(self, prefix: str, suffix: str) -> str | None:
+        """First syzbot asset link like ".../<prefix>...<suffix>" (e.g. "disk-", ".raw.xz")."""
+        for lnk in self.asset_links:
+            if "/" + prefix in lnk and lnk.endswith(suffix):
+                return lnk
+        return None
+
+    @property
+    def lore_threads(self) -> list[str]:
+        """lore links to whole threads (ending in /T/)."""
+        return [h for h in self.lore_links if _LORE_THREAD_RE.search(h)]
+
+
+def parse_bug_page(html: str) -> BugPage:
+    """Extract a BugPage from bug page HTML in one pass."""
+    title: str | None = None
+    status: str | None = None
+    status_link: str | None = None
+    subsystems: list[str] | None = None
+    text_links: list[str] = []
+    asset_links: list[str] = []
+    lore_links: list[str] = []
+
+    def add_href(value: str) -> None:
+        if "/text?tag=" in value:
+            t = _TEXT_RE.search(value)
+            if t:
+                text_links.append(html_unescape_amp(t.group(0)))
+        if "syzbot-assets/" in value:
+            a = _ASSET_RE.search(value)
+            if a:
+                asset_links.append(a.group(0))
+        if "lore.kernel.org" in value:
+            lore_links.append(unescape(value))
+
+    for m in _TOKEN_RE.finditer(html):
+        kind = m.lastgroup
+        if kind == "href":
+            add_href(m.group("href"))
+        elif kind is None:
+            tok = m.group(0)
+            if tok[0] == "/":
+                text_links.append(html_unescape_amp(tok))
+            else:
+                asset_links.append(tok)
+        elif kind == "status":
+            if status is None:
+                status = unescape(m.group("status")).strip()
+                link = _HREF_RE.search(m.group("status_attrs"))
+                status_link = unescape(link.group(1)) if link else None
+            for value in _HREF_RE.findall(m.group("status_attrs")):
+                add_href(value)
+        elif kind == "subsystems":
+            block = m.group("subsystems")
+            if subsystems is None:
+                subsystems = [s.strip() for s in _SUBSYSTEM_RE.findall(block) if s.strip()]
+            for value in _HREF_RE.findall(block):
+                add_href(value)
+        elif title is None:
+            title = unescape(m.group("bold")).strip()
+
+    lower = html.lower()
+    return BugPage(
+        title=title,
+        status=status,
+        status_link=status_link,
+        subsystems=subsystems or [],
+        text_links=text_links,
+        asset_links=asset_links,
+        lore_links=lore_links,
+        fix_signals=[kw for kw in FIX_SIGNALS if kw.lower() in lower],
+    )
@@ -0,0 +1,503 @@
+"""Shared on-disk caches of syzbot bug pages, lore thread subjects and scan results.
+
+Not a standalone tool; imported by syzbot_pick_top3.py,
+syzbot_pick_unclaimed.py, syzbot_bug_summary.py, syzbot_check_in_progress.py
+and syzbot_prepare_qemu_repro.py, which all scrape the same
+``bug?extid=...`` pages.
+
+Pages are stored gzip-compressed, one file per extid, under
+``$XDG_CACHE_HOME/kernel_radar/syzbot`` (``--cache-dir``). Each tool still
+runs its own extraction on the cached HTML.
+
+Freshness
+---------
+- TTL: a page fetched more than ``--cache-ttl`` seconds ago is refetched
+  (file mtime is the fetch time).
+- Status changes: the pickers take bugs from the open ``upstream`` list; a
+  cached page whose title no longer matches that list, or whose status says
+  the bug was fixed/invalid/dup, is refetched (`open_bug_validator`).
+- Size: once the directory exceeds ``--cache-max-mb``, the least recently
+  used pages (file atime, set on every hit) are deleted.
+
+Lore thread subjects
+--------------------
+A lore ``/T/`` thread's root subject never changes, so resolved subjects are
+kept permanently in ``lore-thread-subjects.json`` in the same directory,
+keyed by the Message-ID in the thread URL (the list name, scheme and
+fragment do not matter). `thread_subjects` fetches the misses concurrently.
+Failed fetches are not cached.
+
+Incremental scans
+-----------------
+Each picker run stores the ``upstream?json=1`` list it saw
+(``upstream-snapshot.json``: extid -> title), so the next run can report
+which bugs were added, removed or retitled (`UpstreamSnapshot`). With
+``--incremental`` a picker also keeps what it scraped per bug
+(``verdicts-<tool>.json``, `VerdictStore`) and reuses it for bugs whose
+title is unchanged, only scraping new or retitled bugs and results older
+than ``--verdict-max-age-days``. Filters are applied to the stored results
+on every run, so they can change between runs. A picker can also refuse
+to reuse some results (`VerdictStore.get(reusable=...)`): the unclaimed
+picker rescrapes every bug that would otherwise be a candidate, so its
+claim signals are always current (the page and thread subject caches make
+that cheap).
+
+``--no-cache`` bypasses the bug page and thread subject caches.
+
+Usage
+-----
+  from syzbot_cache import add_cache_args, cache_from_args
+
+  add_cache_args(ap)
+  cache = cache_from_args(args)
+  html = cache.page(bug_url, fetch) if cache else fetch(bug_url)
+
+  subjects = thread_subjects(urls, fetch_subject, thread_cache_from_args(args))
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import sys
+import urllib.parse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from syzbot_bugpage import parse_bug_page
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_MAX_MB = 256
+
+_EXTID_RE = re.compile(r"^[0-9A-Za-z_-]+$")
+
+
+def default_cache_dir() -> Path:
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_home / "kernel_radar" / "syzbot"
+
+
+def extid_from_url(bug_url: str) -> str | None:
+    extids = urllib.parse.parse_qs(urllib.parse.urlparse(bug_url).query).get("extid")
+    if extids and _EXTID_RE.match(extids[0]):
+        return extids[0]
+    return None
+
+
+class BugPageCache:
+    """Bug page HTML keyed by extid, with TTL and an LRU size limit. Thread-safe."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_MB << 20,
+    ):
+        self.dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total: int | None = None
+
+    def _path(self, extid: str) -> Path:
+        return self.dir / f"{extid}.html.gz"
+
+    def get(self, extid: str, validate: Callable[[str], bool] | None = None) -> str | None:
+        """The cached page, or None if missing, expired or rejected by `validate`."""
+        path = self._path(extid)
+        now = time.time()
+        try:
+            st = path.stat()
+            if now - st.st_mtime > self.ttl_seconds:
+                return None
+            html = gzip.decompress(path.read_bytes()).decode("utf-8", "replace")
+        except (OSError, EOFError, gzip.BadGzipFile):
+            return None
+        if validate is not None and not validate(html):
+            return None
+        try:
+            os.utime(path, (now, st.st_mtime))
+        except OSError:
+            pass
+        return html
+
+    def put(self, extid: str, html: str) -> None:
+        path = self._path(extid)
+        data = gzip.compress(html.encode("utf-8"), compresslevel=6)
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            try:
+                old = path.stat().st_size
+            except OSError:
+                old = 0
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan_total()
+            else:
+                self._total += len(data) - old
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def page(self, bug_url: str, fetch: Callable[[str], str], validate: Callable[[str], bool] | None = None) -> str:
+        """The page for `bug_url` from the cache, or fetched with `fetch` and stored."""
+        extid = extid_from_url(bug_url)
+        if extid is None:
+            return fetch(bug_url)
+        html = self.get(extid, validate)
+        if html is not None:
+            self.hits += 1
+            return html
+        self.misses += 1
+        html = fetch(bug_url)
+        self.put(extid, html)
+        return html
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for path in self.dir.glob("*.html.gz"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out.append((st.st_atime, st.st_size, path))
+        return out
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self) -> None:
+        # Drop least recently used pages until 90% of the limit.
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 9 // 10
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+
+def open_bug_validator(title: str) -> Callable[[str], bool]:
+    """Validator for a bug taken from the open upstream list under `title`.
+
+    The cached page is stale if it shows another title (the bug was
+    retitled) or a closed status (the bug was reopened since).
+    """
+
+    def validate(html: str) -> bool:
+        page = parse_bug_page(html)
+        if page.title is not None and page.title != title:
+            return False
+        status = (page.status or "").lower()
+        return not any(x in status for x in ("fixed", "invalid", "dup"))
+
+    return validate
+
+
+_LORE_THREAD_RE = re.compile(r"^https?://lore\.kernel\.org/[^/]+/([^/]+)/T/?(?:[?#].*)?$")
+
+
+def thread_key(thread_url: str) -> str:
+    """Cache key for a lore thread URL: its Message-ID, else the URL without fragment."""
+    url = thread_url.strip()
+    m = _LORE_THREAD_RE.match(url)
+    if m:
+        return urllib.parse.unquote(m.group(1))
+    return url.split("#", 1)[0]
+
+
+class ThreadSubjectCache:
+    """Permanent lore thread URL -> root subject map, stored as one JSON file. Thread-safe."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._subjects: dict[str, str] | None = None
+        self._new: dict[str, str] = {}
+
+    def _load(self) -> dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+    def get(self, thread_url: str) -> str | None:
+        with self._lock:
+            if self._subjects is None:
+                self._subjects = self._load()
+            return self._subjects.get(thread_key(thread_url))
+
+    def put(self, thread_url: str, subject: str) -> None:
+        key = thread_key(thread_url)
+        with self._lock:
+            if self._subjects is None:
+                self._subjects = self._load()
+            self._subjects[key] = subject
+            self._new[key] = subject
+
+    def save(self) -> None:
+        # Merge into the file as it is now, so concurrent runs keep each
+        # other's entries.
+        with self._lock:
+            if not self._new:
+                return
+            merged = self._load()
+            merged.update(self._new)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(merged, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+                tmp.replace(self.path)
+            except OSError:
+                return
+            self._new.clear()
+
+
+def thread_subjects(
+    thread_urls: Iterable[str],
+    fetch: Callable[[str], str | None],
+    cache: ThreadSubjectCache | None = None,
+    jobs: int = 6,
+) -> dict[str, str | None]:
+    """Root subject for each lore thread URL (None if it could not be fetched).
+
+    Cached subjects are returned directly; the rest are fetched with up to
+    `jobs` concurrent `fetch` calls (in the calling thread for jobs=1) and
+    added to the cache.
+    """
+    out: dict[str, str | None] = {}
+    misses: list[str] = []
+    for url in thread_urls:
+        if url in out or url in misses:
+            continue
+        subject = cache.get(url) if cache is not None else None
+        if subject is None:
+            misses.append(url)
+        else:
+            out[url] = subject
+    if not misses:
+        return out
+    if jobs <= 1 or len(misses) == 1:
+        fetched = [fetch(url) for url in misses]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(misses))) as ex:
+            fetched = list(ex.map(fetch, misses))
+    for url, subject in zip(misses, fetched):
+        out[url] = subject
+        if subject is not None and cache is not None:
+            cache.put(url, subject)
+    return out
+
+
+@dataclass(frozen=True)
+class UpstreamDiff:
+    added: list[str]  # extids, in upstream-list order
+    removed: list[str]
+    retitled: list[tuple[str, str, str]]  # (extid, old title, new title)
+    previous: float | None  # when the previous snapshot was taken
+
+
+def upstream_titles(bugs: list, base: str) -> dict[str, str]:
+    """extid -> title for an upstream?json=1 bug list, in list order."""
+    out: dict[str, str] = {}
+    for bug in bugs:
+        title = str(bug.get("title", "")).strip()
+        link = str(bug.get("link", "")).strip()
+        extid = extid_from_url(base + link if link.startswith("/") else link)
+        if title and extid and extid not in out:
+            out[extid] = title
+    return out
+
+
+class UpstreamSnapshot:
+    """The upstream bug list (extid -> title) as seen by the previous run."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.taken: float | None = data.get("taken") if isinstance(data, dict) else None
+        bugs = data.get("bugs") if isinstance(data, dict) else None
+        self.bugs: dict[str, str] = {str(k): str(v) for k, v in bugs.items()} if isinstance(bugs, dict) else {}
+
+    def diff(self, current: dict[str, str]) -> UpstreamDiff:
+        return UpstreamDiff(
+            added=[e for e in current if e not in self.bugs],
+            removed=[e for e in self.bugs if e not in current],
+            retitled=[(e, self.bugs[e], t) for e, t in current.items() if e in self.bugs and self.bugs[e] != t],
+            previous=self.taken,
+        )
+
+    def save(self, current: dict[str, str]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"taken": time.time(), "bugs": current}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            print(f"WARN: failed to write {self.path}: {e}", file=sys.stderr)
+
+
+def print_upstream_diff(diff: UpstreamDiff, current: dict[str, str], verbose: bool = False) -> None:
+    if diff.previous is None:
+        print(f"upstream: {len(current)} bugs (no previous snapshot)", file=sys.stderr)
+        return
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(diff.previous))
+    print(
+        f"upstream: {len(current)} bugs; since {when}: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {len(diff.retitled)} retitled",
+        file=sys.stderr,
+    )
+    if not verbose:
+        return
+    for extid in diff.added:
+        print(f"+ {extid} {current[extid]}")
+    for extid in diff.removed:
+        print(f"- {extid}")
+    for extid, old, new in diff.retitled:
+        print(f"~ {extid} {old!r} -> {new!r}")
+
+
+class VerdictStore:
+    """Per-bug scrape results of one tool, reused while the bug's title is unchanged. Thread-safe."""
+
+    def __init__(self, path: Path, max_age_seconds: float):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.reused = 0
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self._verdicts: dict[str, dict] = data if isinstance(data, dict) else {}
+
+    def get(self, extid: str, title: str, reusable: Callable[[dict], bool] | None = None) -> dict | None:
+        """The stored result, unless the title changed, it is too old or `reusable` rejects it."""
+        with self._lock:
+            v = self._verdicts.get(extid)
+            if not isinstance(v, dict) or v.get("title") != title:
+                return None
+            if time.time() - float(v.get("scraped_at") or 0) > self.max_age_seconds:
+                return None
+            scraped = v.get("scraped")
+            if not isinstance(scraped, dict) or (reusable is not None and not reusable(scraped)):
+                return None
+            self.reused += 1
+            return scraped
+
+    def put(self, extid: str, title: str, scraped: dict) -> None:
+        with self._lock:
+            self._verdicts[extid] = {"title": title, "scraped_at": time.time(), "scraped": scraped}
+
+    def save(self, keep: Iterable[str]) -> None:
+        # Bugs no longer in the upstream list are dropped.
+        keep = set(keep)
+        with self._lock:
+            data = {e: v for e, v in self._verdicts.items() if e in keep}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            print(f"WARN: failed to write {self.path}: {e}", file=sys.stderr)
+
+
+def add_cache_args(ap: argparse.ArgumentParser, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+    ap.add_argument(
+        "--cache-dir",
+        default=None,
+        help=f"bug page cache directory (default: {default_cache_dir()})",
+    )
+    ap.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=ttl_seconds,
+        help=f"refetch cached bug pages older than this many seconds (default: {ttl_seconds:g})",
+    )
+    ap.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help=f"evict least recently used bug pages above this size (default: {DEFAULT_MAX_MB})",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always fetch bug pages and lore thread subjects; do not use or fill the caches",
+    )
+
+
+def _cache_dir(args: argparse.Namespace) -> Path:
+    return Path(args.cache_dir).expanduser() if args.cache_dir else default_cache_dir()
+
+
+def cache_from_args(args: argparse.Namespace) -> BugPageCache | None:
+    if args.no_cache:
+        return None
+    return BugPageCache(
+        _cache_dir(args),
+        ttl_seconds=args.cache_ttl,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+    )
+
+
+def thread_cache_from_args(args: argparse.Namespace) -> ThreadSubjectCache | None:
+    if args.no_cache:
+        return None
+    return ThreadSubjectCache(_cache_dir(args) / "lore-thread-subjects.json")
+
+
+def add_incremental_args(ap: argparse.ArgumentParser) -> None:
+    """Flags for the pickers; use together with add_cache_args()."""
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "only scrape bugs that are new or retitled since they were last scraped; "
+            "reuse stored results for the rest"
+        ),
+    )
+    ap.add_argument(
+        "--verdict-max-age-days",
+        type=float,
+        default=7,
+        help="with --incremental, rescrape bugs whose stored result is older than this (default: 7)",
+    )
+    ap.add_argument(
+        "--upstream-diff",
+        action="store_true",
+        help="print bugs added/removed/retitled since the previous run's upstream snapshot, then exit",
+    )
+
+
+def upstream_snapshot_from_args(args: argparse.Namespace) -> UpstreamSnapshot:
+    return UpstreamSnapshot(_cache_dir(args) / "upstream-snapshot.json")
+
+
+def verdicts_from_args(args: argparse.Namespace, tool: str) -> VerdictStore | None:
+    if not args.incremental:
+        return None
+    return VerdictStore(_cache_dir(args) / f"verdicts-{tool}.json", args.verdict_max_age_days * 86400)
@@ -28,17 +28,17 @@ from __future__ import annotations
 import argparse
 import re
 import urllib.parse
-import urllib.request
 from html import unescape
 
-BASE = "https://syzkaller.appspot.com"
+from radar_http import get_text
+from syzbot_bugpage import BASE, parse_bug_page
+from syzbot_cache import add_cache_args, cache_from_args, thread_cache_from_args, thread_subjects
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
 def http_get_text(url: str) -> str:
-    req = urllib.request.Request(url, headers=UA)
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return r.read().decode("utf-8", "replace")
+    return get_text(url, timeout=30, headers=UA)
 
 
 def lore_thread_subject(thread_url: str) -> str | None:
@@ -61,7 +61,10 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("extid", nargs="?", help="syzbot extid (e.g. 3e68572c...)")
     ap.add_argument("--bug-url", help="full bug URL (overrides extid)")
+    # The point of this tool is the current status: keep cached pages briefly.
+    add_cache_args(ap, ttl_seconds=600)
     args = ap.parse_args()
+    cache = cache_from_args(args)
 
     if args.bug_url:
         bug_url = args.bug_url
@@ -70,19 +73,12 @@ def main() -> int:
             ap.error("need extid or --bug-url")
         bug_url = f"{BASE}/bug?extid={urllib.parse.quote(args.extid)}"
 
-    html = http_get_text(bug_url)
-
-    title = None
-    m = re.search(r"<b>(.*?)</b><br>", html, re.I | re.S)
-    if m:
-        title = unescape(m.group(1)).strip()
+    html = cache.page(bug_url, http_get_text) if cache else http_get_text(bug_url)
 
-    status_text = None
-    status_link = None
-    m = re.search(r"Status:\s*<a[^>]*href=\"([^\"]+)\"[^>]*>([^<]+)</a>", html, re.I)
-    if m:
-        status_link = unescape(m.group(1))
-        status_text = unescape(m.group(2)).strip()
+    page = parse_bug_page(html)
+    title = page.title
+    status_text = page.status
+    status_link = page.status_link
 
     print("Bug:", bug_url)
     if title:
@@ -93,21 +89,13 @@ def main() -> int:
         print("Status link:", status_link)
 
     # Extract lore links. syzkaller sometimes links directly to lore threads.
-    hrefs = [unescape(x) for x in re.findall(r"href=\"([^\"]+)\"", html)]
-
-    lore_links = []
-    for h in hrefs:
-        if "lore.kernel.org" in h:
-            if h not in lore_links:
-                lore_links.append(h)
-
-    patch_like = []
-    for h in lore_links:
-        if not re.search(r"/T/\s*$", h):
-            continue
-        subj = lore_thread_subject(h)
-        if subj and "[PATCH" in subj.upper():
-            patch_like.append((h, subj))
+    lore_links = list(dict.fromkeys(page.lore_links))
+    thread_links = list(dict.fromkeys(page.lore_threads))
+    subject_cache = thread_cache_from_args(args)
+    subjects = thread_subjects(thread_links, lore_thread_subject, subject_cache)
+    if subject_cache is not None:
+        subject_cache.save()
+    patch_like = [(h, subjects[h]) for h in thread_links if "[PATCH" in (subjects[h] or "").upper()]
 
     if lore_links:
         print("\nLore links:")
@@ -122,12 +110,7 @@ def main() -> int:
             print("   ", h)
 
     # Detect explicit "fixed" signals on page (not always present).
-    fix_signals = []
-    # Avoid overly-broad keywords like "Patched" which can appear in label docs.
-    for kw in ["upstream: fixed", "fixed:", "Fix commit", "Fixing commit", "Resolved", "dup"]:
-        if kw.lower() in html.lower():
-            fix_signals.append(kw)
-
+    fix_signals = page.fix_signals
     if fix_signals:
         print("\nFix-ish signals found on bug page:")
         print(" ", ", ".join(fix_signals))
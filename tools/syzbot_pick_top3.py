@@ -26,6 +26,7 @@ Usage
 -----
   ./tools/syzbot_pick_top3.py
   ./tools/syzbot_pick_top3.py --count 3 --scan-limit 400
+  ./tools/syzbot_pick_top3.py --incremental   # rescrape only new/retitled bugs
 
 Notes
 -----
@@ -41,10 +42,22 @@ import re
 import sys
 import time
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 
-BASE = "https://syzkaller.appspot.com"
+from radar_http import get_text
+from syzbot_bugpage import BASE, parse_bug_page
+from syzbot_cache import (
+    BugPageCache,
+    add_cache_args,
+    add_incremental_args,
+    cache_from_args,
+    open_bug_validator,
+    print_upstream_diff,
+    upstream_snapshot_from_args,
+    upstream_titles,
+    verdicts_from_args,
+)
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
@@ -64,56 +77,26 @@ class Candidate:
 def http_get_text(url: str) -> str:
     if url.startswith("/"):
         url = BASE + url
-    req = urllib.request.Request(url, headers=UA)
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return r.read().decode("utf-8", "replace")
-
-
-def html_unescape_amp(s: str) -> str:
-    # syzkaller HTML uses &amp; in hrefs; we only need to unescape that.
-    return s.replace("&amp;", "&")
-
-
-def scrape_bug_page(bug_url: str) -> dict[str, object]:
-    html = http_get_text(bug_url)
-
-    # Status line looks like:
-    #   Status: <a ...>upstream: reported C repro on YYYY/MM/DD HH:MM</a><br>
-    status = None
-    m = re.search(r"Status:\s*<a[^>]*>([^<]+)</a>", html, re.I)
-    if m:
-        status = m.group(1).strip()
-
-    # Subsystems block looks like:
-    #   Subsystems: <span class="bug-label"><a href="/upstream/s/net">net</a></span>
-    subsystems: list[str] = []
-    m = re.search(r"Subsystems:\s*(.*?)<br", html, re.I | re.S)
-    if m:
-        block = m.group(1)
-        subsystems = [
-            s.strip()
-            for s in re.findall(r"/upstream/s/[^\"]+\">([^<]+)</a>", block)
-            if s.strip()
-        ]
+    return get_text(url, timeout=30, headers=UA)
 
-    # Reproducer/config/crash are linked via /text?tag=...&x=...
-    text_links = [
-        html_unescape_amp(x) for x in re.findall(r"(/text\?tag=[^\"\s<>]+)", html)
-    ]
-
-    def pick(tag: str) -> str | None:
-        for lnk in text_links:
-            if f"tag={tag}" in lnk:
-                return BASE + lnk
-        return None
 
+def scrape_bug_page(bug_url: str, cache: BugPageCache | None = None, title: str | None = None) -> dict[str, object]:
+    if bug_url.startswith("/"):
+        bug_url = BASE + bug_url
+    if cache is None:
+        html = http_get_text(bug_url)
+    else:
+        html = cache.page(bug_url, http_get_text, open_bug_validator(title) if title else None)
+
+    # Reproducer/config/crash are linked via /text?tag=...&x=...
+    page = parse_bug_page(html)
     return {
-        "status": status,
-        "subsystems": subsystems,
-        "kernel_config_url": pick("KernelConfig"),
-        "repro_c_url": pick("ReproC"),
-        "repro_syz_url": pick("ReproSyz"),
-        "crash_report_url": pick("CrashReport"),
+        "status": page.status,
+        "subsystems": page.subsystems,
+        "kernel_config_url": page.text_link("KernelConfig"),
+        "repro_c_url": page.text_link("ReproC"),
+        "repro_syz_url": page.text_link("ReproSyz"),
+        "crash_report_url": page.text_link("CrashReport"),
     }
 
 
@@ -185,7 +168,10 @@ def main(argv: list[str]) -> int:
         default=None,
         help="exclude bugs whose syzbot subsystems match this regex (case-insensitive)",
     )
+    add_cache_args(ap)
+    add_incremental_args(ap)
     args = ap.parse_args(argv)
+    cache = cache_from_args(args)
 
     include_re = re.compile(args.include_title_re, re.I) if args.include_title_re else None
     if args.no_exclude_title:
@@ -216,6 +202,15 @@ def main(argv: list[str]) -> int:
         print("Unexpected upstream JSON schema", file=sys.stderr)
         return 2
 
+    current = upstream_titles(bugs, BASE)
+    snapshot = upstream_snapshot_from_args(args)
+    if args.incremental or args.upstream_diff:
+        print_upstream_diff(snapshot.diff(current), current, verbose=args.upstream_diff)
+    snapshot.save(current)
+    if args.upstream_diff:
+        return 0
+    verdicts = verdicts_from_args(args, "top3")
+
     found: list[Candidate] = []
 
     for idx, bug in enumerate(bugs[: args.scan_limit]):
@@ -231,10 +226,17 @@ def main(argv: list[str]) -> int:
             continue
 
         # We only consider issues that have reproducers embedded on the bug page.
-        try:
-            scraped = scrape_bug_page(link)
-        except Exception:
-            continue
+        extid = extract_extid(BASE + link if link.startswith("/") else link)
+        misses = cache.misses if cache else 0
+        scraped = verdicts.get(extid, title) if verdicts is not None and extid else None
+        fetched = scraped is None
+        if scraped is None:
+            try:
+                scraped = scrape_bug_page(link, cache=cache, title=title)
+            except Exception:
+                continue
+            if verdicts is not None and extid:
+                verdicts.put(extid, title, scraped)
 
         subsystems = list(scraped.get("subsystems") or [])
         subsystems_lc = [s.strip().lower() for s in subsystems if isinstance(s, str) and s.strip()]
@@ -273,7 +275,9 @@ def main(argv: list[str]) -> int:
         if len(found) >= args.count:
             break
 
-        time.sleep(args.sleep)
+        # only pages actually fetched count against the server
+        if fetched and (cache is None or cache.misses != misses):
+            time.sleep(args.sleep)
 
     for c in found:
         print(f"\n- {c.title}")
@@ -293,6 +297,10 @@ def main(argv: list[str]) -> int:
         if c.crash_report_url:
             print(f"  crash report: {c.crash_report_url}")
 
+    if verdicts is not None:
+        verdicts.save(current)
+        print(f"incremental: reused {verdicts.reused} stored results", file=sys.stderr)
+
     if not found:
         print("No candidates found; try increasing --scan-limit or relaxing filters.")
         return 1
@@ -35,6 +35,21 @@ Usage
 -----
   ./tools/syzbot_pick_unclaimed.py
   ./tools/syzbot_pick_unclaimed.py --count 5 --scan-limit 2000
+  ./tools/syzbot_pick_unclaimed.py --jobs 8 --rate 10
+  ./tools/syzbot_pick_unclaimed.py --incremental
+
+With --jobs N, up to N bug pages are scraped concurrently; each worker
+fetches its page's lore thread pages in turn, so at most N requests are in
+flight. Requests (bug pages and lore thread pages) are spaced globally by
+--rate per second (default 1/--sleep). Results are still evaluated in
+upstream-list order, so the picks are the same as a sequential scan, and no
+new pages are started once --count candidates are confirmed.
+
+With --incremental, stored results are reused (and re-filtered) for bugs
+whose title is unchanged and that the filters reject anyway. Every bug that
+could be picked is scraped again, so its claim signals ([PATCH] threads, fix
+signals) are never stale; the bug page and thread subject caches keep that
+cheap. See tools/syzbot_cache.py.
 
 Output
 ------
@@ -48,16 +63,38 @@ Prints a shortlist with:
 from __future__ import annotations
 
 import argparse
+import collections
+import concurrent.futures
 import datetime as dt
 import json
 import re
+import sys
+import threading
 import time
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from html import unescape
+from typing import Callable, Iterable, Iterator
+
+from radar_http import get_text
+from syzbot_bugpage import BASE, parse_bug_page
+from syzbot_cache import (
+    BugPageCache,
+    ThreadSubjectCache,
+    VerdictStore,
+    add_cache_args,
+    add_incremental_args,
+    cache_from_args,
+    extid_from_url,
+    open_bug_validator,
+    print_upstream_diff,
+    thread_cache_from_args,
+    thread_subjects,
+    upstream_snapshot_from_args,
+    upstream_titles,
+    verdicts_from_args,
+)
 
-BASE = "https://syzkaller.appspot.com"
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 # Heuristic: avoid obvious hardware-ish bugs by title.
@@ -82,22 +119,37 @@ class Candidate:
     lore_threads: list[str]
 
 
-def http_get_text(url: str, timeout: int) -> str:
-    if url.startswith("/"):
-        url = BASE + url
-    req = urllib.request.Request(url, headers=UA)
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read().decode("utf-8", "replace")
+class RateLimiter:
+    """Spaces requests to at most `rate` per second across all threads."""
+
+    def __init__(self, rate: float | None) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
 
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            slot = max(time.monotonic(), self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
 
-def html_unescape_amp(s: str) -> str:
-    return s.replace("&amp;", "&")
 
+def http_get_text(url: str, timeout: int, limiter: RateLimiter | None = None) -> str:
+    if url.startswith("/"):
+        url = BASE + url
+    if limiter is not None:
+        limiter.wait()
+    return get_text(url, timeout=timeout, headers=UA)
 
-def lore_thread_subject(thread_url: str, timeout: int) -> str | None:
+
+def lore_thread_subject(thread_url: str, timeout: int, limiter: RateLimiter | None = None) -> str | None:
     """Best-effort extract of a lore /T/ thread subject."""
     try:
-        html = http_get_text(thread_url, timeout=timeout)
+        html = http_get_text(thread_url, timeout=timeout, limiter=limiter)
     except Exception:
         return None
     m = re.search(r"<u\s+id=u>(.*?)</u>", html, re.I | re.S)
@@ -106,65 +158,103 @@ def lore_thread_subject(thread_url: str, timeout: int) -> str | None:
     return unescape(m.group(1)).strip()
 
 
-def scrape_bug_page(link: str, timeout: int) -> dict[str, object]:
-    html = http_get_text(link, timeout=timeout)
-
-    m = re.search(r"<b>(.*?)</b><br>", html, re.I | re.S)
-    title = unescape(m.group(1)).strip() if m else None
-
-    m = re.search(r"Status:\s*<a[^>]*href=\"([^\"]+)\"[^>]*>([^<]+)</a>", html, re.I)
-    status_text = unescape(m.group(2)).strip() if m else None
-    status_thread = unescape(m.group(1)) if m else None
-
-    subsystems: list[str] = []
-    m = re.search(r"Subsystems:\s*(.*?)<br", html, re.I | re.S)
-    if m:
-        block = m.group(1)
-        subsystems = [
-            s.strip()
-            for s in re.findall(r"/upstream/s/[^\"]+\">([^<]+)</a>", block)
-            if s.strip()
-        ]
-
-    text_links = [
-        html_unescape_amp(x) for x in re.findall(r"(/text\?tag=[^\"\s<>]+)", html)
-    ]
-
-    def pick(tag: str) -> str | None:
-        for lnk in text_links:
-            if f"tag={tag}" in lnk:
-                return BASE + lnk
-        return None
-
-    hrefs = [unescape(x) for x in re.findall(r"href=\"([^\"]+)\"", html)]
-    lore_threads = [h for h in hrefs if "lore.kernel.org" in h and re.search(r"/T/\s*$", h)]
+def scrape_bug_page(
+    link: str,
+    timeout: int,
+    limiter: RateLimiter | None = None,
+    cache: BugPageCache | None = None,
+    title: str | None = None,
+    subject_cache: ThreadSubjectCache | None = None,
+) -> dict[str, object]:
+    def fetch(url: str) -> str:
+        return http_get_text(url, timeout=timeout, limiter=limiter)
+
+    url = BASE + link if link.startswith("/") else link
+    if cache is None:
+        html = fetch(url)
+    else:
+        html = cache.page(url, fetch, open_bug_validator(title) if title else None)
 
-    patch_threads: list[str] = []
-    for t in lore_threads[:6]:
-        subj = lore_thread_subject(t, timeout=timeout)
-        if subj and "[PATCH" in subj.upper():
-            patch_threads.append(t)
+    page = parse_bug_page(html)
+    lore_threads = page.lore_threads
 
-    fix_signals: list[str] = []
-    for kw in ["upstream: fixed", "fixed:", "Fix commit", "Fixing commit", "Resolved", "dup"]:
-        if kw.lower() in html.lower():
-            fix_signals.append(kw)
+    # One at a time: this already runs in one of the --jobs scan workers.
+    subjects = thread_subjects(
+        lore_threads[:6], lambda t: lore_thread_subject(t, timeout=timeout, limiter=limiter), subject_cache, jobs=1
+    )
+    patch_threads = [t for t in lore_threads[:6] if "[PATCH" in (subjects.get(t) or "").upper()]
 
     return {
-        "title": title,
-        "status": status_text,
-        "status_thread": status_thread,
-        "subsystems": subsystems,
-        "kernel_config": pick("KernelConfig"),
-        "repro_c": pick("ReproC"),
-        "repro_syz": pick("ReproSyz"),
-        "crash_report": pick("CrashReport"),
+        "title": page.title,
+        "status": page.status,
+        "status_thread": page.status_link,
+        "subsystems": page.subsystems,
+        "kernel_config": page.text_link("KernelConfig"),
+        "repro_c": page.text_link("ReproC"),
+        "repro_syz": page.text_link("ReproSyz"),
+        "crash_report": page.text_link("CrashReport"),
         "lore_threads": lore_threads,
         "patch_threads": patch_threads,
-        "fix_signals": fix_signals,
+        "fix_signals": page.fix_signals,
     }
 
 
+def scan_bug_pages(
+    targets: Iterable[tuple[str, str]],
+    timeout: int,
+    jobs: int,
+    limiter: RateLimiter | None,
+    cache: BugPageCache | None = None,
+    subject_cache: ThreadSubjectCache | None = None,
+    verdicts: VerdictStore | None = None,
+    reusable: Callable[[dict], bool] | None = None,
+) -> Iterator[tuple[str, str, dict[str, object] | None]]:
+    """Scrape (title, link) targets with up to `jobs` pages in flight.
+
+    Yields (title, link, scraped) in input order; scraped is None if the page
+    could not be fetched. Only a small window ahead of the consumer is
+    submitted, and pages not yet started are cancelled when it stops.
+    Results stored in `verdicts` are reused without fetching if
+    `reusable(result)` allows it; new ones are added to it.
+    """
+    it = iter(targets)
+    pending: collections.deque = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+
+        def scrape(title: str, link: str, extid: str | None) -> dict[str, object]:
+            scraped = scrape_bug_page(link, timeout, limiter, cache, title, subject_cache)
+            if verdicts is not None and extid:
+                verdicts.put(extid, title, scraped)
+            return scraped
+
+        def submit_next() -> None:
+            for title, link in it:
+                extid = extid_from_url(BASE + link if link.startswith("/") else link)
+                stored = verdicts.get(extid, title, reusable) if verdicts is not None and extid else None
+                if stored is not None:
+                    fut: concurrent.futures.Future = concurrent.futures.Future()
+                    fut.set_result(stored)
+                else:
+                    fut = ex.submit(scrape, title, link, extid)
+                pending.append((title, link, fut))
+                return
+
+        try:
+            for _ in range(max(1, jobs) * 2):
+                submit_next()
+            while pending:
+                title, link, fut = pending.popleft()
+                try:
+                    scraped = fut.result()
+                except Exception:
+                    scraped = None
+                submit_next()
+                yield title, link, scraped
+        finally:
+            for _, _, fut in pending:
+                fut.cancel()
+
+
 def parse_reported_date(status_text: str) -> dt.date | None:
     # Example:
     #   upstream: reported C repro on 2026/01/13 18:06
@@ -183,6 +273,15 @@ def main(argv: list[str]) -> int:
     ap.add_argument("--scan-limit", type=int, default=1500)
     ap.add_argument("--timeout", type=int, default=20)
     ap.add_argument("--sleep", type=float, default=0.1)
+    ap.add_argument("--jobs", type=int, default=1, help="bug pages to scrape concurrently (default: 1)")
+    ap.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="max HTTP requests per second across all jobs (default: 1/--sleep)",
+    )
+    add_cache_args(ap)
+    add_incremental_args(ap)
     ap.add_argument(
         "--reported-after",
         default=None,
@@ -244,6 +343,8 @@ def main(argv: list[str]) -> int:
             raise SystemExit("--reported-after must be in YYYY/MM/DD format")
     if args.max_age_days is not None and args.max_age_days < 0:
         raise SystemExit("--max-age-days must be >= 0")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be >= 1")
 
     include_re = re.compile(args.include_title_re, re.I) if args.include_title_re else None
     if args.no_exclude_title:
@@ -266,71 +367,104 @@ def main(argv: list[str]) -> int:
     if not isinstance(bugs, list):
         raise SystemExit("Unexpected upstream JSON schema")
 
-    picked: list[Candidate] = []
-    seen_titles: set[str] = set()
+    current = upstream_titles(bugs, BASE)
+    snapshot = upstream_snapshot_from_args(args)
+    if args.incremental or args.upstream_diff:
+        print_upstream_diff(snapshot.diff(current), current, verbose=args.upstream_diff)
+    snapshot.save(current)
+    if args.upstream_diff:
+        return 0
+
+    def targets() -> Iterator[tuple[str, str]]:
+        # Title-only filters, applied before any bug page is fetched.
+        seen_titles: set[str] = set()
+        for bug in bugs[: args.scan_limit]:
+            title = str(bug.get("title", "")).strip()
+            link = str(bug.get("link", "")).strip()
+            if not title or not link:
+                continue
+            if title in seen_titles:
+                continue
+            seen_titles.add(title)
 
-    for bug in bugs[: args.scan_limit]:
-        title = str(bug.get("title", "")).strip()
-        link = str(bug.get("link", "")).strip()
-        if not title or not link:
-            continue
-        if title in seen_titles:
-            continue
-        seen_titles.add(title)
+            if include_re and not include_re.search(title):
+                continue
 
-        if include_re and not include_re.search(title):
-            continue
+            if exclude_re and exclude_re.search(title):
+                continue
 
-        if exclude_re and exclude_re.search(title):
-            continue
+            yield title, link
 
-        try:
-            scraped = scrape_bug_page(link, timeout=args.timeout)
-        except Exception:
-            continue
+    rate = args.rate if args.rate is not None else (1.0 / args.sleep if args.sleep > 0 else None)
+    limiter = RateLimiter(rate)
+    picked: list[Candidate] = []
 
-        subsystems = list(scraped.get("subsystems") or [])
+    def wanted(scraped: dict) -> bool:
+        # Every filter except the claim signals (fix_signals, patch_threads).
+        subsystems = scraped.get("subsystems") or []
         subsystems_lc = [s.strip().lower() for s in subsystems if isinstance(s, str) and s.strip()]
 
         if include_subsystems and not any(s in include_subsystems for s in subsystems_lc):
-            continue
+            return False
 
         if include_subsystem_re and not any(include_subsystem_re.search(s) for s in subsystems_lc):
-            continue
+            return False
 
         if exclude_subsystems and any(s in exclude_subsystems for s in subsystems_lc):
-            continue
+            return False
 
         if exclude_subsystem_re and any(exclude_subsystem_re.search(s) for s in subsystems_lc):
-            continue
+            return False
 
         # must have repro
         if not scraped.get("repro_c") and not scraped.get("repro_syz"):
-            continue
+            return False
 
         status_text = str(scraped.get("status") or "")
         if any(x in status_text.lower() for x in ["fixed", "invalid", "dup"]):
-            continue
-
-        # Exclude if the bug page contains explicit fix-ish signals (including dup).
-        if scraped.get("fix_signals"):
-            continue
+            return False
 
         if reported_after or args.max_age_days is not None:
             d = parse_reported_date(status_text)
             if not d:
-                continue
+                return False
             if reported_after and d < reported_after:
-                continue
+                return False
             if args.max_age_days is not None:
                 cutoff = dt.date.today() - dt.timedelta(days=args.max_age_days)
                 if d < cutoff:
-                    continue
+                    return False
+        return True
+
+    cache = cache_from_args(args)
+    subject_cache = thread_cache_from_args(args)
+    verdicts = verdicts_from_args(args, "unclaimed")
+    scan = scan_bug_pages(
+        targets(),
+        timeout=args.timeout,
+        jobs=args.jobs,
+        limiter=limiter,
+        cache=cache,
+        subject_cache=subject_cache,
+        verdicts=verdicts,
+        # A stored result is only good for ruling a bug out: possible picks
+        # are rescraped so their claim signals are current.
+        reusable=lambda scraped: not wanted(scraped),
+    )
+    for title, link, scraped in scan:
+        if scraped is None or not wanted(scraped):
+            continue
+
+        # Exclude if the bug page contains explicit fix-ish signals (including dup).
+        if scraped.get("fix_signals"):
+            continue
 
         # exclude if any linked lore /T/ subject contains [PATCH]
         if scraped.get("patch_threads"):
             continue
 
+        subsystems = list(scraped.get("subsystems") or [])
+
         picked.append(
             Candidate(
                 title=str(scraped.get("title") or title),
@@ -354,8 +488,12 @@ def main(argv: list[str]) -> int:
 
         if len(picked) >= args.count:
             break
-
-        time.sleep(args.sleep)
+    scan.close()
+    if subject_cache is not None:
+        subject_cache.save()
+    if verdicts is not None:
+        verdicts.save(current)
+        print(f"incremental: reused {verdicts.reused} stored results", file=sys.stderr)
 
     for c in picked:
         print(f"\n- {c.title}")
@@ -33,15 +33,16 @@ from __future__ import annotations
 import argparse
 import lzma
 import os
-import re
 import sys
 import textwrap
 import time
-import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
 
-BASE = "https://syzkaller.appspot.com"
+from radar_http import get_bytes, get_client
+from syzbot_bugpage import BASE, parse_bug_page
+from syzbot_cache import BugPageCache, add_cache_args, cache_from_args
+
 UA = {"User-Agent": "kernel_radar/0.1 (+local)"}
 
 
@@ -61,54 +62,35 @@ class BugLinks:
 def http_get_bytes(url: str, *, timeout: int) -> bytes:
     if url.startswith("/"):
         url = BASE + url
-    req = urllib.request.Request(url, headers=UA)
     # For small resources (HTML pages and /text?tag=... attachments).
-    # Large assets are streamed via `download_stream`.
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read()
+    # Large assets are streamed via `download_stream` (already .xz; no
+    # Accept-Encoding there so byte ranges stay valid for resume).
+    return get_bytes(url, timeout=timeout, headers=UA)
 
 
 def http_get_text(url: str, *, timeout: int) -> str:
     return http_get_bytes(url, timeout=timeout).decode("utf-8", "replace")
 
 
-def html_unescape_amp(s: str) -> str:
-    return s.replace("&amp;", "&")
-
-
-def scrape_bug_page(extid: str, *, timeout: int) -> BugLinks:
+def scrape_bug_page(extid: str, *, timeout: int, cache: BugPageCache | None = None) -> BugLinks:
     bug_url = f"{BASE}/bug?extid={extid}"
-    html = http_get_text(bug_url, timeout=timeout)
-
-    # /text?tag=...&x=... links
-    text_links = [html_unescape_amp(x) for x in re.findall(r"(/text\?tag=[^\"\s<>]+)", html)]
-
-    def pick_text(tag: str) -> str | None:
-        for lnk in text_links:
-            if f"tag={tag}" in lnk:
-                return BASE + lnk
-        return None
-
-    # syzbot assets are hosted on storage.googleapis.com
-    # We allow both http and https to be safe.
-    asset_links = re.findall(r"https?://storage\.googleapis\.com/syzbot-assets/[^\"\s<>]+", html)
-
-    def pick_asset(prefix: str, suffix: str) -> str | None:
-        for lnk in asset_links:
-            if "/" + prefix in lnk and lnk.endswith(suffix):
-                return lnk
-        return None
+    if cache is None:
+        html = http_get_text(bug_url, timeout=timeout)
+    else:
+        html = cache.page(bug_url, lambda url: http_get_text(url, timeout=timeout))
 
+    # /text?tag=...&x=... links and syzbot assets on storage.googleapis.com
+    page = parse_bug_page(html)
     return BugLinks(
         bug_url=bug_url,
-        disk_xz=pick_asset("disk-", ".raw.xz"),
-        bzimage_xz=pick_asset("bzImage-", ".xz"),
-        vmlinux_xz=pick_asset("vmlinux-", ".xz"),
-        kernel_config=pick_text("KernelConfig"),
-        repro_syz=pick_text("ReproSyz"),
-        repro_log=pick_text("ReproLog"),
-        crash_log=pick_text("CrashLog"),
-        crash_report=pick_text("CrashReport"),
+        disk_xz=page.asset("disk-", ".raw.xz"),
+        bzimage_xz=page.asset("bzImage-", ".xz"),
+        vmlinux_xz=page.asset("vmlinux-", ".xz"),
+        kernel_config=page.text_link("KernelConfig"),
+        repro_syz=page.text_link("ReproSyz"),
+        repro_log=page.text_link("ReproLog"),
+        crash_log=page.text_link("CrashLog"),
+        crash_report=page.text_link("CrashReport"),
     )
 
 
@@ -144,12 +126,12 @@ def download_stream(
                 except OSError:
                     start = 0
 
-            headers = dict(UA)
+            headers = {**UA, "Accept-Encoding": "identity"}
             if start > 0:
                 headers["Range"] = f"bytes={start}-"
 
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=timeout) as r:
+            # retries=0: this loop does its own retry/resume with backoff.
+            with get_client().open(url, headers=headers, timeout=timeout, retries=0) as r:
                 status = getattr(r, "status", None) or r.getcode()
                 # If server ignored Range (200), restart from scratch.
                 if start > 0 and status != 206:
@@ -367,12 +349,13 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="delete and re-download only vmlinux(.xz) for this extid (keeps bzImage/disk)",
     )
+    add_cache_args(ap)
     args = ap.parse_args(argv)
 
     out_dir = Path(args.out or f"repro/{args.extid}")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    links = scrape_bug_page(args.extid, timeout=args.timeout)
+    links = scrape_bug_page(args.extid, timeout=args.timeout, cache=cache_from_args(args))
 
     # Save metadata for debugging / provenance.
     meta = (out_dir / "meta.txt")